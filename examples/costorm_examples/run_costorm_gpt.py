@@ -20,7 +20,7 @@ from knowledge_storm.collaborative_storm.engine import CollaborativeStormLMConfi
 from knowledge_storm.collaborative_storm.modules.callback import LocalConsolePrintCallBackHandler
 from knowledge_storm.lm import OpenAIModel, AzureOpenAIModel
 from knowledge_storm.logging_wrapper import LoggingWrapper
-from knowledge_storm.rm import YouRM, BingSearch, BraveRM, SerperRM, DuckDuckGoSearchRM, TavilySearchRM, SearXNG
+from knowledge_storm.rm import RETRIEVER_REGISTRY
 from knowledge_storm.utils import load_api_key
 
 
@@ -83,29 +83,14 @@ def main(args):
         max_thread_num=args.max_thread_num,
         max_num_round_table_experts=args.max_num_round_table_experts,
         moderator_override_N_consecutive_answering_turn=args.moderator_override_N_consecutive_answering_turn,
-        node_expansion_trigger_count=args.node_expansion_trigger_count)
+        node_expansion_trigger_count=args.node_expansion_trigger_count,
+        max_section_workers=args.max_section_workers)
     logging_wrapper = LoggingWrapper(lm_config)
     callback_handler = LocalConsolePrintCallBackHandler() if args.enable_log_print else None
 
     # Co-STORM is a knowledge curation system which consumes information from the retrieval module.
     # Currently, the information source is the Internet and we use search engine API as the retrieval module.
-    match args.retriever:
-        case 'bing':
-            rm = BingSearch(bing_search_api=os.getenv('BING_SEARCH_API_KEY'), k=runner_argument.retrieve_top_k)
-        case 'you':
-             rm = YouRM(ydc_api_key=os.getenv('YDC_API_KEY'), k=runner_argument.retrieve_top_k)
-        case 'brave':
-            rm = BraveRM(brave_search_api_key=os.getenv('BRAVE_API_KEY'), k=runner_argument.retrieve_top_k)
-        case 'duckduckgo':
-            rm = DuckDuckGoSearchRM(k=runner_argument.retrieve_top_k, safe_search='On', region='us-en')
-        case 'serper':
-            rm = SerperRM(serper_search_api_key=os.getenv('SERPER_API_KEY'), query_params={'autocorrect': True, 'num': 10, 'page': 1})
-        case 'tavily':
-            rm = TavilySearchRM(tavily_search_api_key=os.getenv('TAVILY_API_KEY'), k=runner_argument.retrieve_top_k, include_raw_content=True)
-        case 'searxng':
-            rm = SearXNG(searxng_api_key=os.getenv('SEARXNG_API_KEY'), k=runner_argument.retrieve_top_k)
-        case _:
-             raise ValueError(f'Invalid retriever: {args.retriever}. Choose either "bing", "you", "brave", "duckduckgo", "serper", "tavily", or "searxng"')
+    rm = RETRIEVER_REGISTRY[args.retriever](k=runner_argument.retrieve_top_k)
 
     costorm_runner = CoStormRunner(lm_config=lm_config,
                                    runner_argument=runner_argument,
@@ -159,7 +144,7 @@ if __name__ == '__main__':
     # global arguments
     parser.add_argument('--output-dir', type=str, default='./results/co-storm',
                         help='Directory to store the outputs.')
-    parser.add_argument('--retriever', type=str, choices=['bing', 'you', 'brave', 'serper', 'duckduckgo', 'tavily', 'searxng'],
+    parser.add_argument('--retriever', type=str, choices=list(RETRIEVER_REGISTRY.keys()), required=True,
                         help='The search engine API to use for retrieving information.')
     # hyperparameters for co-storm
     parser.add_argument(
@@ -235,6 +220,13 @@ if __name__ == '__main__':
         default=10,
         help='Trigger node expansion for nodes that contain more than N snippets.'
     )
+    parser.add_argument(
+        '--max_section_workers',
+        type=int,
+        default=16,
+        help=("Maximum number of threads for parallel section generation in the final report (at most 32). "
+              "Consider reducing it if you keep getting 'Exceed rate limit' errors when calling the LM API.")
+    )
 
     # Boolean flags
     parser.add_argument(
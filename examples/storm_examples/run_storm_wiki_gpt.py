@@ -24,7 +24,7 @@ import os
 from argparse import ArgumentParser
 from knowledge_storm import STORMWikiRunnerArguments, STORMWikiRunner, STORMWikiLMConfigs
 from knowledge_storm.lm import OpenAIModel, AzureOpenAIModel
-from knowledge_storm.rm import YouRM, BingSearch, BraveRM, SerperRM, DuckDuckGoSearchRM, TavilySearchRM, SearXNG, AzureAISearch
+from knowledge_storm.rm import RETRIEVER_REGISTRY
 from knowledge_storm.utils import load_api_key
 
 
@@ -69,30 +69,18 @@ def main(args):
         max_perspective=args.max_perspective,
         search_top_k=args.search_top_k,
         max_thread_num=args.max_thread_num,
+        polish_chunk_size=args.polish_chunk_size,
+        cache_dir=args.cache_dir,
+        query_dedup_threshold=args.query_dedup_threshold,
+        checkpoint_path=args.checkpoint_path,
+        max_no_info_streak=args.max_no_info_streak,
+        repeated_question_threshold=args.repeated_question_threshold,
     )
 
     # STORM is a knowledge curation system which consumes information from the retrieval module.
     # Currently, the information source is the Internet and we use search engine API as the retrieval module.
 
-    match args.retriever:
-        case 'bing':
-            rm = BingSearch(bing_search_api=os.getenv('BING_SEARCH_API_KEY'), k=engine_args.search_top_k)
-        case 'you':
-             rm = YouRM(ydc_api_key=os.getenv('YDC_API_KEY'), k=engine_args.search_top_k)
-        case 'brave':
-            rm = BraveRM(brave_search_api_key=os.getenv('BRAVE_API_KEY'), k=engine_args.search_top_k)
-        case 'duckduckgo':
-            rm = DuckDuckGoSearchRM(k=engine_args.search_top_k, safe_search='On', region='us-en')
-        case 'serper':
-            rm = SerperRM(serper_search_api_key=os.getenv('SERPER_API_KEY'), query_params={'autocorrect': True, 'num': 10, 'page': 1})
-        case 'tavily':
-            rm = TavilySearchRM(tavily_search_api_key=os.getenv('TAVILY_API_KEY'), k=engine_args.search_top_k, include_raw_content=True)
-        case 'searxng':
-            rm = SearXNG(searxng_api_key=os.getenv('SEARXNG_API_KEY'), k=engine_args.search_top_k)
-        case 'azure_ai_search':
-            rm = AzureAISearch(azure_ai_search_api_key=os.getenv('AZURE_AI_SEARCH_API_KEY'), k=engine_args.search_top_k)
-        case _:
-             raise ValueError(f'Invalid retriever: {args.retriever}. Choose either "bing", "you", "brave", "duckduckgo", "serper", "tavily", "searxng", or "azure_ai_search"')
+    rm = RETRIEVER_REGISTRY[args.retriever](k=engine_args.search_top_k)
 
     runner = STORMWikiRunner(engine_args, lm_configs, rm)
 
@@ -117,7 +105,7 @@ if __name__ == '__main__':
                         help='Maximum number of threads to use. The information seeking part and the article generation'
                              'part can speed up by using multiple threads. Consider reducing it if keep getting '
                              '"Exceed rate limit" error when calling LM API.')
-    parser.add_argument('--retriever', type=str, choices=['bing', 'you', 'brave', 'serper', 'duckduckgo', 'tavily', 'searxng', 'azure_ai_search'],
+    parser.add_argument('--retriever', type=str, choices=list(RETRIEVER_REGISTRY.keys()), required=True,
                         help='The search engine API to use for retrieving information.')
     # stage of the pipeline
     parser.add_argument('--do-research', action='store_true',
@@ -141,5 +129,18 @@ if __name__ == '__main__':
                         help='Top k collected references for each section title.')
     parser.add_argument('--remove-duplicate', action='store_true',
                         help='If True, remove duplicate content from the article.')
+    parser.add_argument('--polish-chunk-size', type=int, default=3000,
+                        help='When removing duplicates, articles longer than this many words are polished section by '
+                             'section in parallel instead of in a single LM call.')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directory of the semantic caches used when STORM_SEMANTIC_CACHE=1.')
+    parser.add_argument('--query-dedup-threshold', type=float, default=None,
+                        help='Cosine similarity above which search queries of the same turn are searched only once.')
+    parser.add_argument('--checkpoint-path', type=str, default=None,
+                        help='JSONL file to checkpoint finished conversations to, so an interrupted run can resume.')
+    parser.add_argument('--max-no-info-streak', type=int, default=2,
+                        help='Stop a conversation after this many consecutive turns without search results.')
+    parser.add_argument('--repeated-question-threshold', type=float, default=None,
+                        help='Stop a conversation when two consecutive questions reach this cosine similarity.')
 
     main(parser.parse_args())
@@ -0,0 +1,2 @@
+from .llm_cache import *
+from .semantic_cache import *
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from typing import Callable, Dict, Optional, Union
+
+import dspy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "storm")
+DEFAULT_EXPIRE_SECONDS = 7 * 86400
+
+_cache_instances: Dict[str, "DiskLLMCache"] = {}
+_cache_instances_lock = threading.Lock()
+
+
+class DiskLLMCache:
+    """
+    Exact-match on-disk cache for LM outputs.
+
+    The key is a SHA256 hash of the signature name, the signature inputs and the LM configuration (`lm.kwargs`),
+    so any change in the prompt or in the model setup results in a cache miss. Only the raw output string of the
+    LM call is stored; post-processing is re-applied by the caller on every hit. Stored values are serialized with
+    `orjson` (falling back to `json` if it is not installed) and compressed with zlib to keep the cache small.
+
+    Use `get_llm_cache` instead of constructing this class directly so that caching can be switched on and off
+    with the `STORM_LLM_CACHE` environment variable.
+    """
+
+    def __init__(self, cache_dir: str, expire: int = DEFAULT_EXPIRE_SECONDS):
+        """
+        Args:
+            cache_dir (str): Directory to store the cache.
+            expire (int): Seconds before a cached output expires. Defaults to 7 days.
+        """
+        try:
+            import diskcache
+        except ImportError as err:
+            raise ImportError("DiskLLMCache requires `pip install diskcache`.") from err
+
+        self.cache_dir = cache_dir
+        self.expire = expire
+        self.cache = diskcache.Cache(cache_dir)
+
+    @staticmethod
+    def make_key(
+        signature_name: str,
+        lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        **inputs,
+    ) -> str:
+        payload = {
+            "sig": signature_name,
+            "inputs": inputs,
+            "model": getattr(lm, "kwargs", {}),
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def _serialize(value: str) -> bytes:
+        if orjson is not None:
+            payload = orjson.dumps(value)
+        else:
+            payload = json.dumps(value).encode("utf-8")
+        return zlib.compress(payload, 1)
+
+    @staticmethod
+    def _deserialize(payload: bytes) -> str:
+        payload = zlib.decompress(payload)
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+    def get(self, key: str) -> Optional[str]:
+        payload = self.cache.get(key, default=None)
+        if payload is None or isinstance(payload, str):
+            # Entries written before compression was introduced are stored as plain strings.
+            return payload
+        return self._deserialize(payload)
+
+    def set(self, key: str, value: str):
+        self.cache.set(key, self._serialize(value), expire=self.expire)
+
+    def get_or_predict(
+        self,
+        signature_name: str,
+        lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        predict_fn: Callable[[], str],
+        **inputs,
+    ) -> str:
+        """
+        Return the cached output for the given signature inputs or call `predict_fn` and cache its output.
+
+        Args:
+            signature_name (str): Name of the dspy.Signature being predicted.
+            lm: The LM used for the prediction. Its `kwargs` are part of the cache key.
+            predict_fn (Callable[[], str]): Function that runs the LM call and returns the raw output string.
+            **inputs: Inputs of the signature. They are part of the cache key.
+        """
+        key = self.make_key(signature_name, lm, **inputs)
+        result = self.get(key)
+        if result is None:
+            result = predict_fn()
+            self.set(key, result)
+        return result
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv("STORM_LLM_CACHE", "0") == "1"
+
+
+def get_llm_cache(namespace: str) -> Optional[DiskLLMCache]:
+    """
+    Get the process-wide DiskLLMCache stored under `~/.cache/storm/<namespace>/`.
+
+    Returns None unless the environment variable `STORM_LLM_CACHE` is set to 1, so stochastic runs are not
+    affected by default.
+    """
+    if not llm_cache_enabled():
+        return None
+    with _cache_instances_lock:
+        if namespace not in _cache_instances:
+            _cache_instances[namespace] = DiskLLMCache(
+                cache_dir=os.path.join(DEFAULT_CACHE_ROOT, namespace)
+            )
+        return _cache_instances[namespace]
+
+
+def cached_predict(
+    cache: Optional[DiskLLMCache],
+    signature_name: str,
+    lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+    predict_fn: Callable[[], str],
+    **inputs,
+) -> str:
+    """Run `predict_fn` through `cache` if caching is enabled, otherwise call it directly."""
+    if cache is None:
+        return predict_fn()
+    return cache.get_or_predict(signature_name, lm, predict_fn, **inputs)
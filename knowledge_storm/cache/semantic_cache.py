@@ -0,0 +1,333 @@
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .llm_cache import DEFAULT_CACHE_ROOT, DEFAULT_EXPIRE_SECONDS
+
+DEFAULT_ENCODER_NAME = "paraphrase-MiniLM-L6-v2"
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+_semantic_cache_instances: Dict[str, "SemanticCache"] = {}
+_semantic_cache_instances_lock = threading.Lock()
+
+
+def _get_encoder():
+    """Load the SentenceTransformer shared by all semantic caches in the process."""
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            from sentence_transformers import SentenceTransformer
+
+            _encoder = SentenceTransformer(DEFAULT_ENCODER_NAME)
+        return _encoder
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Embed `texts` with the shared encoder and L2-normalize them, so inner products are cosine similarities."""
+    embeddings = _get_encoder().encode(texts, show_progress_bar=False)
+    embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+    return embeddings / np.maximum(
+        np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+    )
+
+
+class SemanticCache:
+    """
+    Embedding-based cache that returns a stored value when a new key is a near-paraphrase of a cached key.
+
+    Keys are embedded with a MiniLM SentenceTransformer and L2-normalized, so the inner product of two embeddings
+    is their cosine similarity. Lookup is an exact inner-product search over all live entries; once the cache
+    holds more than `hnsw_threshold` entries and `faiss` is installed, an approximate HNSW index is used instead.
+    Each entry keeps a `meta` dict so callers can reject a semantic hit whose context (e.g., topic, gathered
+    information) differs.
+
+    Use `get_semantic_cache` instead of constructing this class directly so that caching can be switched on and
+    off with the `STORM_SEMANTIC_CACHE` environment variable.
+    """
+
+    def __init__(
+        self,
+        dim: int = 384,
+        threshold: float = 0.95,
+        cache_path: Optional[str] = None,
+        expire: int = DEFAULT_EXPIRE_SECONDS,
+        hnsw_threshold: int = 10_000,
+    ):
+        """
+        Args:
+            dim (int): Dimension of the key embeddings.
+            threshold (float): Minimum cosine similarity for a cached entry to count as a hit.
+            cache_path (Optional[str]): File to persist the cache to. If None, the cache lives in memory only.
+            expire (int): Seconds before a cached entry expires. Defaults to 7 days.
+            hnsw_threshold (int): Number of entries above which a FAISS HNSW index is used for lookup, if available.
+        """
+        self.dim = dim
+        self.threshold = threshold
+        self.cache_path = cache_path
+        self.expire = expire
+        self.hnsw_threshold = hnsw_threshold
+        # Embeddings and creation times live in preallocated buffers that grow geometrically, so adding an entry
+        # is amortized O(1). Entries are appended in time order, so the expired entries are always a prefix.
+        self._embedding_buffer = np.zeros((16, dim), dtype=np.float32)
+        self._created_at_buffer = np.zeros(16, dtype=np.float64)
+        self.entries: List[Tuple[Any, Dict[str, Any]]] = []
+        self._hnsw_index = None
+        self._faiss_available = True
+        self._lock = threading.Lock()
+        # New entries are appended to `<cache_path>.log` and folded into the snapshot by `_compact`.
+        self._io_lock = threading.Lock()
+        self._log_path = f"{cache_path}.log" if cache_path is not None else None
+        self._num_logged = 0
+        self.compact_min_records = 256
+        if cache_path is not None and (
+            os.path.exists(cache_path) or os.path.exists(self._log_path)
+        ):
+            self._load()
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._embedding_buffer[: len(self.entries)]
+
+    @property
+    def created_at(self) -> np.ndarray:
+        return self._created_at_buffer[: len(self.entries)]
+
+    def _num_expired(self) -> int:
+        """Return the length of the expired prefix of the entries, found by binary search."""
+        return int(
+            np.searchsorted(self.created_at, time.time() - self.expire, side="right")
+        )
+
+    def _get_hnsw_index(self):
+        """Return the FAISS HNSW index over the live entries, or None to fall back to exact search."""
+        if len(self.entries) <= self.hnsw_threshold or not self._faiss_available:
+            return None
+        if self._hnsw_index is None:
+            try:
+                import faiss
+            except ImportError:
+                self._faiss_available = False
+                return None
+            index = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = 64
+            index.add(self.embeddings)
+            self._hnsw_index = index
+        return self._hnsw_index
+
+    def embed(self, text: str) -> np.ndarray:
+        embedding = _get_encoder().encode(text, show_progress_bar=False)
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        return embedding / max(np.linalg.norm(embedding), 1e-12)
+
+    def search(
+        self, embedding: np.ndarray, k: int = 1
+    ) -> List[Tuple[float, Any, Dict]]:
+        """Return up to `k` live entries as (similarity, value, meta), most similar first."""
+        with self._lock:
+            # Expired entries are skipped here and only dropped in batches by `_evict_expired`.
+            start = self._num_expired()
+            num_live = len(self.entries) - start
+            if num_live == 0:
+                return []
+            k = min(k, num_live)
+            index = self._get_hnsw_index()
+            if index is not None:
+                import faiss
+
+                live_ids = faiss.IDSelectorRange(start, len(self.entries))
+                params = faiss.SearchParametersHNSW(sel=live_ids, efSearch=64)
+                scores, top_k = index.search(embedding.reshape(1, -1), k, params=params)
+                scores, top_k = scores[0], top_k[0]
+                hits = [(score, i) for score, i in zip(scores, top_k) if i >= 0]
+            else:
+                scores = self.embeddings[start:] @ embedding
+                # partial selection is O(N); only the k candidates are fully sorted
+                top_k = np.argpartition(-scores, k - 1)[:k]
+                top_k = top_k[np.argsort(-scores[top_k])]
+                hits = [(scores[i], start + i) for i in top_k]
+            return [
+                (float(score), self.entries[i][0], self.entries[i][1])
+                for score, i in hits
+            ]
+
+    def lookup(
+        self,
+        embedding: np.ndarray,
+        match_fn: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Any]:
+        """
+        Return the value of the nearest entry if its similarity reaches the threshold, otherwise None.
+
+        Args:
+            embedding (np.ndarray): Normalized key embedding, as returned by `embed`.
+            match_fn (Optional[Callable]): Extra check on the entry's meta dict; the hit is rejected if it returns False.
+        """
+        for similarity, value, meta in self.search(embedding, k=1):
+            if similarity >= self.threshold and (match_fn is None or match_fn(meta)):
+                return value
+        return None
+
+    def add(
+        self, embedding: np.ndarray, value: Any, meta: Optional[Dict[str, Any]] = None
+    ):
+        # `_io_lock` orders disk writes; `_lock` is only held for the in-memory update so lookups never wait on disk.
+        with self._io_lock:
+            # Taking the timestamp under `_io_lock` keeps the entries, and the log, in creation order.
+            record = (
+                embedding.reshape(-1).astype(np.float32),
+                value,
+                meta if meta is not None else {},
+                time.time(),
+            )
+            with self._lock:
+                self._evict_expired()
+                self._append_entry(*record)
+                num_entries = len(self.entries)
+            if self.cache_path is not None:
+                self._append_log(record)
+                if self._num_logged >= max(self.compact_min_records, num_entries):
+                    self._compact()
+
+    def remove(self, match_fn: Callable[[Dict[str, Any]], bool]) -> int:
+        """Remove every entry whose meta dict satisfies `match_fn` and return how many were removed."""
+        with self._io_lock:
+            with self._lock:
+                keep = [
+                    i for i, (_, meta) in enumerate(self.entries) if not match_fn(meta)
+                ]
+                num_removed = len(self.entries) - len(keep)
+                if num_removed == 0:
+                    return 0
+                self._embedding_buffer = self.embeddings[keep]
+                self._created_at_buffer = self.created_at[keep]
+                self._hnsw_index = None
+                self.entries = [self.entries[i] for i in keep]
+            if self.cache_path is not None:
+                self._compact()
+            return num_removed
+
+    def _append_entry(
+        self, embedding: np.ndarray, value: Any, meta: Dict[str, Any], created_at: float
+    ):
+        size = len(self.entries)
+        if size == len(self._embedding_buffer):
+            growth = max(16, size)
+            self._embedding_buffer = np.concatenate(
+                [
+                    self._embedding_buffer,
+                    np.zeros((growth, self.dim), dtype=np.float32),
+                ]
+            )
+            self._created_at_buffer = np.concatenate(
+                [self._created_at_buffer, np.zeros(growth, dtype=np.float64)]
+            )
+        self._embedding_buffer[size] = embedding
+        self._created_at_buffer[size] = created_at
+        if self._hnsw_index is not None:
+            self._hnsw_index.add(embedding.reshape(1, -1))
+        self.entries.append((value, meta))
+
+    def _evict_expired(self, force: bool = False):
+        """
+        Drop the expired prefix of the entries. Caller holds `_lock`.
+
+        HNSW does not support removal, so dropping entries means rebuilding the index on the next lookup. Unless
+        `force` is set, eviction therefore waits until at least a quarter of the entries have expired, which keeps
+        the rebuild cost amortized; until then `search` skips the expired entries.
+        """
+        num_expired = self._num_expired()
+        if num_expired == 0 or (not force and 4 * num_expired < len(self.entries)):
+            return
+        self._embedding_buffer = self.embeddings[num_expired:].copy()
+        self._created_at_buffer = self.created_at[num_expired:].copy()
+        self._hnsw_index = None
+        self.entries = self.entries[num_expired:]
+
+    def _make_cache_dir(self):
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _append_log(self, record: Tuple[np.ndarray, Any, Dict[str, Any], float]):
+        """Append one entry to the log next to the snapshot. Caller holds `_io_lock`."""
+        self._make_cache_dir()
+        with open(self._log_path, "ab") as f:
+            pickle.dump(record, f)
+        self._num_logged += 1
+
+    def _compact(self):
+        """
+        Rewrite the snapshot from the live entries and truncate the log. Caller holds `_io_lock`.
+
+        Compaction runs once the log is as long as the snapshot, so the total write cost stays linear in the
+        number of inserts.
+        """
+        with self._lock:
+            data = {
+                "embeddings": self.embeddings.copy(),
+                "entries": list(self.entries),
+                "created_at": self.created_at.copy(),
+            }
+        self._make_cache_dir()
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+        if os.path.exists(self._log_path):
+            os.remove(self._log_path)
+        self._num_logged = 0
+
+    def _load(self):
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "rb") as f:
+                data = pickle.load(f)
+            if data["embeddings"].shape[1] != self.dim:
+                return
+            self._embedding_buffer = data["embeddings"].astype(np.float32)
+            self._created_at_buffer = np.asarray(data["created_at"], dtype=np.float64)
+            self.entries = data["entries"]
+        if os.path.exists(self._log_path):
+            with open(self._log_path, "rb") as f:
+                while True:
+                    try:
+                        record = pickle.load(f)
+                    except (EOFError, pickle.UnpicklingError):
+                        # A write interrupted mid-record leaves a truncated tail; keep everything before it.
+                        break
+                    if record[0].shape[0] != self.dim:
+                        continue
+                    self._append_entry(*record)
+                    self._num_logged += 1
+        self._evict_expired(force=True)
+
+
+def semantic_cache_enabled() -> bool:
+    return os.getenv("STORM_SEMANTIC_CACHE", "0") == "1"
+
+
+def get_semantic_cache(
+    namespace: str, threshold: float = 0.95, cache_dir: Optional[str] = None
+) -> Optional[SemanticCache]:
+    """
+    Get the process-wide SemanticCache persisted to `<cache_dir>/<namespace>.pkl`.
+
+    `cache_dir` defaults to `~/.cache/storm/semantic`. Returns None unless the environment variable
+    `STORM_SEMANTIC_CACHE` is set to 1, so paraphrased questions are answered afresh by default.
+    """
+    if not semantic_cache_enabled():
+        return None
+    if cache_dir is None:
+        cache_dir = os.path.join(DEFAULT_CACHE_ROOT, "semantic")
+    cache_path = os.path.join(cache_dir, f"{namespace}.pkl")
+    with _semantic_cache_instances_lock:
+        if cache_path not in _semantic_cache_instances:
+            _semantic_cache_instances[cache_path] = SemanticCache(
+                threshold=threshold, cache_path=cache_path
+            )
+        return _semantic_cache_instances[cache_path]
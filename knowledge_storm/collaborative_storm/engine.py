@@ -254,6 +254,14 @@ class RunnerArgument:
             "help": "Trigger node expansion for node that contain more than N snippets"
         },
     )
+    max_section_workers: int = field(
+        default=16,
+        metadata={
+            "help": "Maximum number of threads for parallel section generation in report generation. "
+            "Sections run on the shared pool of 32 threads, so values above 32 have no further effect. "
+            "Consider reducing it if keep getting 'Exceed rate limit' error when calling LM API."
+        },
+    )
     disable_moderator: bool = field(
         default=False,
         metadata={"help": "If True, disable moderator."},
@@ -522,6 +530,7 @@ class CoStormRunner:
             topic=self.runner_argument.topic,
             knowledge_base_lm=self.lm_config.knowledge_base_lm,
             node_expansion_trigger_count=self.runner_argument.node_expansion_trigger_count,
+            max_section_workers=self.runner_argument.max_section_workers,
         )
         self.discourse_manager = DiscourseManager(
             lm_config=self.lm_config,
@@ -567,6 +576,7 @@ class CoStormRunner:
             data=data["knowledge_base"],
             knowledge_base_lm=costorm_runner.lm_config.knowledge_base_lm,
             node_expansion_trigger_count=costorm_runner.runner_argument.node_expansion_trigger_count,
+            max_section_workers=costorm_runner.runner_argument.max_section_workers,
         )
         return costorm_runner
 
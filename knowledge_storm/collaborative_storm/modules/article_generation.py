@@ -1,9 +1,14 @@
+import bisect
 import dspy
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Set, Union
+import itertools
+import threading
+from concurrent.futures import as_completed
+from typing import Dict, Optional, Set, Union
 
 from .collaborative_storm_utils import clean_up_section
+from ...cache import cached_predict, get_llm_cache
 from ...dataclass import KnowledgeBase, KnowledgeNode
+from ...runtime import fan_out_executor
 
 
 class ArticleGenerationModule(dspy.Module):
@@ -12,10 +17,17 @@ class ArticleGenerationModule(dspy.Module):
     def __init__(
         self,
         engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        max_section_workers: int = 16,
+        max_delta_citations: int = 5,
     ):
         super().__init__()
         self.write_section = dspy.Predict(WriteSection)
+        self.write_section_delta = dspy.Predict(WriteSectionDelta)
         self.engine = engine
+        self.max_section_workers = max_section_workers
+        # sections whose cited information changed by at most this many items are edited instead of rewritten
+        self.max_delta_citations = max_delta_citations
+        self.llm_cache = get_llm_cache("article_generation")
 
     def _get_cited_information_string(
         self,
@@ -23,21 +35,42 @@ class ArticleGenerationModule(dspy.Module):
         knowledge_base: KnowledgeBase,
         max_words: int = 1500,
     ):
-        information = []
-        cur_word_count = 0
-        for index in sorted(list(all_citation_index)):
-            info = knowledge_base.info_uuid_to_info_dict[index]
-            snippet = info.snippets[0]
-            info_text = f"[{index}]: {snippet} (Question: {info.meta['question']}. Query: {info.meta['query']})"
-            cur_snippet_length = len(info_text.split())
-            if cur_snippet_length + cur_word_count > max_words:
-                break
-            cur_word_count += cur_snippet_length
-            information.append(info_text)
-        return "\n".join(information)
+        sorted_indices = sorted(all_citation_index)
+        infos = [knowledge_base.info_uuid_to_info_dict[i] for i in sorted_indices]
+        # find how many snippets fit in the word budget with a prefix sum instead of re-splitting every snippet
+        cum_word_counts = list(itertools.accumulate(info.word_count for info in infos))
+        cutoff = bisect.bisect_right(cum_word_counts, max_words)
+        return "\n".join(
+            f"[{index}]: {info.snippets[0]} (Question: {info.meta['question']}. Query: {info.meta['query']})"
+            for index, info in zip(sorted_indices[:cutoff], infos[:cutoff])
+        )
+
+    @staticmethod
+    def _precompute_citations(root: KnowledgeNode) -> Dict[int, Set[int]]:
+        """
+        Collect the citation indices of every subtree in a single post-order traversal.
+
+        Returns:
+            Dict[int, Set[int]]: Maps `id(node)` to the same set `node.collect_all_content()` would return.
+        """
+        node_to_citations = {}
+
+        def _collect(node):
+            citations = set(node.content)
+            for child in node.children:
+                citations.update(_collect(child))
+            node_to_citations[id(node)] = citations
+            return citations
+
+        _collect(root)
+        return node_to_citations
 
     def gen_section(
-        self, topic: str, node: KnowledgeNode, knowledge_base: KnowledgeBase
+        self,
+        topic: str,
+        node: KnowledgeNode,
+        knowledge_base: KnowledgeBase,
+        all_citation_index: Optional[Set[int]] = None,
     ):
         if node is None or len(node.content) == 0:
             return ""
@@ -47,29 +80,97 @@ class ArticleGenerationModule(dspy.Module):
             and not node.need_regenerate_synthesize_output
         ):
             return node.synthesize_output
-        all_citation_index = node.collect_all_content()
+        if all_citation_index is None:
+            all_citation_index = node.collect_all_content()
+        if node.synthesize_output and node.prev_citation_set is not None:
+            added = all_citation_index - node.prev_citation_set
+            removed = node.prev_citation_set - all_citation_index
+            if len(added) + len(removed) <= self.max_delta_citations:
+                synthesize_output = self._edit_section(
+                    topic=topic,
+                    node=node,
+                    knowledge_base=knowledge_base,
+                    added=added,
+                    removed=removed,
+                )
+                node.synthesize_output = synthesize_output
+                node.need_regenerate_synthesize_output = False
+                node.prev_citation_set = set(all_citation_index)
+                return node.synthesize_output
         information = self._get_cited_information_string(
             all_citation_index=all_citation_index, knowledge_base=knowledge_base
         )
         with dspy.settings.context(lm=self.engine):
             synthesize_output = clean_up_section(
-                self.write_section(
-                    topic=topic, info=information, section=node.name
-                ).output
+                cached_predict(
+                    self.llm_cache,
+                    "WriteSection",
+                    self.engine,
+                    lambda: self.write_section(
+                        topic=topic, info=information, section=node.name
+                    ).output,
+                    topic=topic,
+                    info=information,
+                    section=node.name,
+                )
             )
         node.synthesize_output = synthesize_output
         node.need_regenerate_synthesize_output = False
+        node.prev_citation_set = set(all_citation_index)
         return node.synthesize_output
 
+    def _edit_section(
+        self,
+        topic: str,
+        node: KnowledgeNode,
+        knowledge_base: KnowledgeBase,
+        added: Set[int],
+        removed: Set[int],
+    ) -> str:
+        """Update the previously written section with only the information that changed since it was written."""
+        if len(added) == 0 and len(removed) == 0:
+            return node.synthesize_output
+        added_info = self._get_cited_information_string(
+            all_citation_index=added, knowledge_base=knowledge_base
+        )
+        removed_ids = ", ".join(f"[{i}]" for i in sorted(removed))
+        with dspy.settings.context(lm=self.engine):
+            return clean_up_section(
+                cached_predict(
+                    self.llm_cache,
+                    "WriteSectionDelta",
+                    self.engine,
+                    lambda: self.write_section_delta(
+                        topic=topic,
+                        section=node.name,
+                        prior_output=node.synthesize_output,
+                        added_info=added_info,
+                        removed_ids=removed_ids,
+                    ).output,
+                    topic=topic,
+                    section=node.name,
+                    prior_output=node.synthesize_output,
+                    added_info=added_info,
+                    removed_ids=removed_ids,
+                )
+            )
+
     def forward(self, knowledge_base: KnowledgeBase):
         all_nodes = knowledge_base.collect_all_nodes()
+        node_to_citations = self._precompute_citations(knowledge_base.root)
         node_to_paragraph = {}
+        # the shared executor is process-wide, so cap the number of concurrent section LM calls here
+        section_semaphore = threading.BoundedSemaphore(self.max_section_workers)
 
         # Define a function to generate paragraphs for nodes
         def _node_generate_paragraph(node):
-            node_gen_paragraph = self.gen_section(
-                topic=knowledge_base.topic, node=node, knowledge_base=knowledge_base
-            )
+            with section_semaphore:
+                node_gen_paragraph = self.gen_section(
+                    topic=knowledge_base.topic,
+                    node=node,
+                    knowledge_base=knowledge_base,
+                    all_citation_index=node_to_citations[id(node)],
+                )
             lines = node_gen_paragraph.split("\n")
             if lines[0].strip().replace("*", "").replace("#", "") == node.name:
                 lines = lines[1:]
@@ -77,7 +178,8 @@ class ArticleGenerationModule(dspy.Module):
             path = " -> ".join(node.get_path_from_root())
             return path, node_gen_paragraph
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
+        # Each section is an independent LM call, so the pool is network-bound rather than CPU-bound.
+        with fan_out_executor(self.max_section_workers) as executor:
             # Submit all tasks
             future_to_node = {
                 executor.submit(_node_generate_paragraph, node): node
@@ -121,3 +223,25 @@ class WriteSection(dspy.Signature):
         prefix="Write the section with proper inline citations (Start your writing. Don't include the page title, section name, or try to write other sections. Do not start the section with topic name.):\n",
         format=str,
     )
+
+
+class WriteSectionDelta(dspy.Signature):
+    """Update an existing Wikipedia section after the collected information changed. You will be given the topic, the section, the current section text, the newly collected information and the citation indices that are no longer available.
+    Integrate the new information with inline citations and remove the statements that are only supported by the unavailable citations. Keep the rest of the section unchanged.
+    Here is the format of your writing:
+    Use [1], [2], ..., [n] in line (for example, "The capital of the United States is Washington, D.C.[1][3]."). You DO NOT need to include a References or Sources section to list the sources at the end.
+    """
+
+    topic = dspy.InputField(prefix="The topic of the page: ", format=str)
+    section = dspy.InputField(prefix="The section you need to update: ", format=str)
+    prior_output = dspy.InputField(prefix="The current section text:\n", format=str)
+    added_info = dspy.InputField(
+        prefix="The newly collected information:\n", format=str
+    )
+    removed_ids = dspy.InputField(
+        prefix="Citations that are no longer available: ", format=str
+    )
+    output = dspy.OutputField(
+        prefix="Write the updated section with proper inline citations (Start your writing. Don't include the page title, section name, or try to write other sections. Do not start the section with topic name.):\n",
+        format=str,
+    )
@@ -1,5 +1,9 @@
+import asyncio
+import copy
 import dspy
-from typing import Union, List
+import functools
+from concurrent.futures import Executor
+from typing import Optional, Union, List
 
 from .callback import BaseCallbackHandler
 from .collaborative_storm_utils import (
@@ -8,6 +12,7 @@ from .collaborative_storm_utils import (
     extract_cited_storm_info,
     separate_citations,
 )
+from ...cache import cached_predict, get_llm_cache, get_semantic_cache
 from ...logging_wrapper import LoggingWrapper
 from ...utils import ArticleTextProcessing
 from ...interface import Information
@@ -62,8 +67,27 @@ class AnswerQuestionModule(dspy.Module):
         self.retriever = retriever
         self.max_search_queries = max_search_queries
         self.logging_wrapper = logging_wrapper
+        self.llm_cache = get_llm_cache("question_answering")
+        self.retrieval_semantic_cache = get_semantic_cache("question_to_query")
+        self.answer_semantic_cache = get_semantic_cache("answer_question")
 
     def retrieve_information(self, topic, question):
+        # reuse queries and search results of a near-paraphrased question on the same topic
+        question_embedding = None
+        if self.retrieval_semantic_cache is not None:
+            question_embedding = self.retrieval_semantic_cache.embed(
+                f"{topic}\n{question}"
+            )
+            cached = self.retrieval_semantic_cache.lookup(
+                question_embedding, match_fn=lambda meta: meta.get("topic") == topic
+            )
+            if cached is not None:
+                queries, searched_results = copy.deepcopy(cached)
+                # count the reused queries too, so query statistics match an uncached run
+                self.logging_wrapper.add_query_count(count=len(queries))
+                for storm_info in searched_results:
+                    storm_info.meta["question"] = question
+                return queries, searched_results
         # decompose question to queries
         with self.logging_wrapper.log_event(
             f"AnswerQuestionModule.question_to_query ({hash(question)})"
@@ -80,15 +104,58 @@ class AnswerQuestionModule(dspy.Module):
         with self.logging_wrapper.log_event(
             f"AnswerQuestionModule.retriever.retrieve ({hash(question)})"
         ):
-            # retrieve information using retriever
-            searched_results: List[Information] = self.retriever.retrieve(
-                list(set(queries)), exclude_urls=[]
+            # retrieve information using retriever; queries already issued in this run are served from the cache
+            searched_results: List[Information] = (
+                self.logging_wrapper.retrieval_cache.retrieve(
+                    self.retriever, queries, exclude_urls=[]
+                )
             )
         # update storm information meta to include the question
         for storm_info in searched_results:
             storm_info.meta["question"] = question
+        if self.retrieval_semantic_cache is not None:
+            self.retrieval_semantic_cache.add(
+                question_embedding,
+                copy.deepcopy((queries, searched_results)),
+                meta={"topic": topic},
+            )
         return queries, searched_results
 
+    def _answer_question(self, topic: str, question: str, info_text: str, style: str):
+        """Run AnswerQuestion, reusing the answer of a near-paraphrased question over the same information."""
+        question_embedding = None
+        if self.answer_semantic_cache is not None:
+            question_embedding = self.answer_semantic_cache.embed(
+                f"{topic}\n{question}"
+            )
+            answer = self.answer_semantic_cache.lookup(
+                question_embedding,
+                match_fn=lambda meta: meta.get("topic") == topic
+                and meta.get("info") == info_text
+                and meta.get("style") == style,
+            )
+            if answer is not None:
+                return answer
+        answer = cached_predict(
+            self.llm_cache,
+            "AnswerQuestion",
+            self.question_answering_lm,
+            lambda: self.answer_question(
+                topic=topic, question=question, info=info_text, style=style
+            ).answer,
+            topic=topic,
+            question=question,
+            info=info_text,
+            style=style,
+        )
+        if self.answer_semantic_cache is not None:
+            self.answer_semantic_cache.add(
+                question_embedding,
+                answer,
+                meta={"topic": topic, "info": info_text, "style": style},
+            )
+        return answer
+
     def forward(
         self,
         topic: str,
@@ -135,9 +202,9 @@ class AnswerQuestionModule(dspy.Module):
                 with dspy.settings.context(
                     lm=self.question_answering_lm, show_guidelines=False
                 ):
-                    answer = self.answer_question(
-                        topic=topic, question=question, info=info_text, style=style
-                    ).answer
+                    answer = self._answer_question(
+                        topic=topic, question=question, info_text=info_text, style=style
+                    )
                     answer = ArticleTextProcessing.remove_uncompleted_sentences_with_citations(
                         answer
                     )
@@ -161,3 +228,31 @@ class AnswerQuestionModule(dspy.Module):
             cited_info=cited_searched_results,
             response=answer,
         )
+
+    async def aforward(
+        self,
+        topic: str,
+        question: str,
+        mode: str = "brief",
+        style: str = "conversational",
+        callback_handler: BaseCallbackHandler = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Async counterpart of `forward`, so that callers can answer many questions concurrently with `asyncio.gather`.
+
+        The LM and retriever clients are blocking, so the work runs in a worker thread of `executor` (the event
+        loop's default executor if None); dspy settings are thread-local and are entered inside that thread by
+        `forward`. Other arguments and the return value are the same as `forward`.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                self.forward,
+                topic=topic,
+                question=question,
+                mode=mode,
+                style=style,
+                callback_handler=callback_handler,
+            ),
+        )
@@ -343,7 +343,7 @@ class ExpandNodeModule(dspy.Module):
 
     def _get_cited_info_meta_string(self, node, knowledge_base):
         meta_string = set()
-        for index in sorted(list(node.content)):
+        for index in sorted(node.content):
             info = knowledge_base.info_uuid_to_info_dict[index]
             intent = f"Question: {info.meta['question']}\nQuery: {info.meta['query']}"
             meta_string.add(intent)
@@ -8,9 +8,9 @@ Additionally, the system generates a first draft of the report, which is then us
 The synthesized conversation is presented to the user to help them quickly catch up on the system's current knowledge about the topic.
 """
 
+import asyncio
 import dspy
 import concurrent.futures
-from threading import Lock
 from typing import List, Optional, Union, TYPE_CHECKING
 
 from .callback import BaseCallbackHandler
@@ -181,73 +181,96 @@ class WarmStartConversation(dspy.Module):
         )
 
     def forward(self, topic: str):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aforward(topic=topic))
+        # asyncio.run() cannot be nested inside a running event loop (e.g., Jupyter or an async server), so drive
+        # the conversation on its own loop in a helper thread instead.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aforward(topic=topic)).result()
+
+    async def aforward(self, topic: str):
+        # The blocking LM and retriever calls run in a pool sized to max_thread, rather than the loop's default
+        # executor which caps at min(32, cpus + 4).
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_thread
+        ) as executor:
+            return await self._aforward(topic=topic, executor=executor)
+
+    async def _aforward(self, topic: str, executor: concurrent.futures.Executor):
+        loop = asyncio.get_running_loop()
         with self.logging_wrapper.log_event(
             "warm start, perspective guided QA: identify experts"
         ):
             # do background research, generate some experts
-            experts, background_seeking_dialogue = self.generate_warmstart_experts(
-                topic=topic
+            experts, background_seeking_dialogue = await loop.run_in_executor(
+                executor, self.generate_warmstart_experts, topic
             )
         # init list to store the dialogue history
         conversation_history: List[ConversationTurn] = []
-        lock = Lock()
+
+        def ask_question(expert, history):
+            with dspy.settings.context(lm=self.question_asking_lm):
+                return self.ask_question(
+                    topic=topic, history=history, current_expert=expert
+                ).question
 
         # hierarchical chat: chat with one expert. Generate question, get answer
-        def process_expert(expert):
+        # All coroutines run on one event loop thread, so conversation_history needs no lock.
+        async def process_expert(expert, semaphore):
             expert_name, expert_descriptoin = expert.split(":")
-            for idx in range(self.max_turn_per_experts):
-                with self.logging_wrapper.log_event(
-                    f"warm start, perspective guided QA: expert {expert_name}; turn {idx + 1}"
-                ):
-                    try:
-                        with lock:
+            async with semaphore:
+                for idx in range(self.max_turn_per_experts):
+                    with self.logging_wrapper.log_event(
+                        f"warm start, perspective guided QA: expert {expert_name}; turn {idx + 1}"
+                    ):
+                        try:
                             history = self.format_dialogue_question_history_string(
                                 conversation_history
                             )
-                        with dspy.settings.context(lm=self.question_asking_lm):
-                            question = self.ask_question(
-                                topic=topic, history=history, current_expert=expert
-                            ).question
-                        answer = self.answer_question_module(
-                            topic=topic,
-                            question=question,
-                            mode="brief",
-                            style="conversational",
-                        )
-                        conversation_turn = ConversationTurn(
-                            role=expert,
-                            claim_to_make=question,
-                            raw_utterance=answer.response,
-                            utterance_type="Support",
-                            queries=answer.queries,
-                            raw_retrieved_info=answer.raw_retrieved_info,
-                            cited_info=answer.cited_info,
-                        )
-                        if self.callback_handler is not None:
-                            self.callback_handler.on_warmstart_update(
-                                message="\n".join(
-                                    [
-                                        f"Finish browsing {url}"
-                                        for url in [
-                                            i.url for i in answer.raw_retrieved_info
+                            question = await loop.run_in_executor(
+                                executor, ask_question, expert, history
+                            )
+                            answer = await self.answer_question_module.aforward(
+                                topic=topic,
+                                question=question,
+                                mode="brief",
+                                style="conversational",
+                                executor=executor,
+                            )
+                            conversation_turn = ConversationTurn(
+                                role=expert,
+                                claim_to_make=question,
+                                raw_utterance=answer.response,
+                                utterance_type="Support",
+                                queries=answer.queries,
+                                raw_retrieved_info=answer.raw_retrieved_info,
+                                cited_info=answer.cited_info,
+                            )
+                            if self.callback_handler is not None:
+                                self.callback_handler.on_warmstart_update(
+                                    message="\n".join(
+                                        [
+                                            f"Finish browsing {url}"
+                                            for url in [
+                                                i.url for i in answer.raw_retrieved_info
+                                            ]
                                         ]
-                                    ]
+                                    )
                                 )
-                            )
-                        with lock:
                             conversation_history.append(conversation_turn)
-                    except Exception as e:
-                        print(f"Error processing expert {expert}: {e}")
-
-        # multi-thread conversation
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_thread
-        ) as executor:
-            futures = [
-                executor.submit(process_expert, expert)
+                        except Exception as e:
+                            print(f"Error processing expert {expert}: {e}")
+
+        # concurrent conversation, at most self.max_thread experts in flight
+        semaphore = asyncio.Semaphore(self.max_thread)
+        await asyncio.gather(
+            *[
+                process_expert(expert, semaphore)
                 for expert in experts[: min(len(experts), self.max_num_experts)]
             ]
-            concurrent.futures.wait(futures)
+        )
 
         conversation_history = [background_seeking_dialogue] + conversation_history
 
@@ -102,6 +102,7 @@ class KnowledgeNode:
         children: Optional[List["KnowledgeNode"]] = None,
         synthesize_output: Optional[str] = None,
         need_regenerate_synthesize_output: bool = True,
+        prev_citation_set: Optional[Set[int]] = None,
     ):
         """
         Initializes a KnowledgeNode instance.
@@ -110,6 +111,7 @@ class KnowledgeNode:
             name (str): The name of the node.
             content (list, optional): A list of information uuid. Defaults to None.
             parent (KnowledgeNode, optional): The parent node of the current node. Defaults to None.
+            prev_citation_set (set, optional): Information uuids of the subtree used to write `synthesize_output`. Defaults to None.
         """
         self.name = name
         self.content: Set[int] = set(content) if content is not None else set()
@@ -117,6 +119,9 @@ class KnowledgeNode:
         self.parent = parent
         self.synthesize_output = synthesize_output
         self.need_regenerate_synthesize_output = need_regenerate_synthesize_output
+        self.prev_citation_set: Optional[Set[int]] = (
+            set(prev_citation_set) if prev_citation_set is not None else None
+        )
 
     def collect_all_content(self):
         """
@@ -253,6 +258,11 @@ class KnowledgeNode:
             "parent": self.parent.name if self.parent else None,
             "synthesize_output": self.synthesize_output,
             "need_regenerate_synthesize_output": self.need_regenerate_synthesize_output,
+            "prev_citation_set": (
+                sorted(self.prev_citation_set)
+                if self.prev_citation_set is not None
+                else None
+            ),
         }
 
     @classmethod
@@ -279,6 +289,7 @@ class KnowledgeNode:
                 need_regenerate_synthesize_output=data.get(
                     "need_regenerate_synthesize_output", True
                 ),
+                prev_citation_set=data.get("prev_citation_set", None),
             )
             for child_data in data["children"]:
                 child_node = helper(cls, child_data, parent_node=node)
@@ -310,12 +321,15 @@ class KnowledgeBase:
         topic: str,
         knowledge_base_lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
         node_expansion_trigger_count: int,
+        max_section_workers: int = 16,
     ):
         """
         Initializes a KnowledgeBase instance.
 
         Args:
             topic (str): The topic of the knowledge base
+            max_section_workers (int): Maximum number of sections generated in parallel. Sections run on the shared
+                thread pool of 32 threads, so values above 32 have no further effect.
             expand_node_module (dspy.Module): The module that organize knowledge base in place.
                 The module should accept knowledge base as param. E.g. expand_node_module(self)
             article_generation_module (dspy.Module): The module that generate report from knowledge base.
@@ -343,7 +357,7 @@ class KnowledgeBase:
             node_expansion_trigger_count=node_expansion_trigger_count,
         )
         self.article_generation_module = ArticleGenerationModule(
-            engine=knowledge_base_lm
+            engine=knowledge_base_lm, max_section_workers=max_section_workers
         )
         self.gen_summary_module = KnowledgeBaseSummaryModule(engine=knowledge_base_lm)
 
@@ -375,11 +389,13 @@ class KnowledgeBase:
         data: Dict,
         knowledge_base_lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
         node_expansion_trigger_count: int,
+        max_section_workers: int = 16,
     ):
         knowledge_base = cls(
             topic=data["topic"],
             knowledge_base_lm=knowledge_base_lm,
             node_expansion_trigger_count=node_expansion_trigger_count,
+            max_section_workers=max_section_workers,
         )
         knowledge_base.root = KnowledgeNode.from_dict(data["tree"])
         knowledge_base.info_hash_to_uuid_dict = {
@@ -1,4 +1,5 @@
 import concurrent.futures
+import copy
 import dspy
 import functools
 import hashlib
@@ -90,6 +91,20 @@ class Information:
             16,
         )
 
+    @functools.cached_property
+    def word_count(self) -> int:
+        """Whitespace word count of the first snippet together with its question and query.
+
+        Computed once on first access; it matches the length of the "[i]: snippet (Question: ... Query: ...)"
+        line used when packing cited information into a word budget.
+        """
+        return (
+            len(self.snippets[0].split())
+            + len(self.meta.get("question", "").split())
+            + len(self.meta.get("query", "").split())
+            + 3
+        )
+
     def _meta_str(self):
         """Generate a string representation of relevant meta information."""
         return f"Question: {self.meta.get('question', '')}, Query: {self.meta.get('query', '')}"
@@ -285,39 +300,86 @@ class Retriever:
 
         return name_to_usage
 
+    def _retrieve_query(self, q: str, exclude_urls: List[str]) -> List[Information]:
+        retrieved_data_list = self.rm(query_or_queries=[q], exclude_urls=exclude_urls)
+        local_to_return = []
+        for data in retrieved_data_list:
+            for i in range(len(data["snippets"])):
+                # STORM generate the article with citations. We do not consider multi-hop citations.
+                # Remove citations in the source to avoid confusion.
+                data["snippets"][i] = ArticleTextProcessing.remove_citations(
+                    data["snippets"][i]
+                )
+            storm_info = Information.from_dict(data)
+            storm_info.meta["query"] = q
+            local_to_return.append(storm_info)
+        return local_to_return
+
     def retrieve(
         self, query: Union[str, List[str]], exclude_urls: List[str] = []
     ) -> List[Information]:
         queries = query if isinstance(query, list) else [query]
         to_return = []
 
-        def process_query(q):
-            retrieved_data_list = self.rm(
-                query_or_queries=[q], exclude_urls=exclude_urls
-            )
-            local_to_return = []
-            for data in retrieved_data_list:
-                for i in range(len(data["snippets"])):
-                    # STORM generate the article with citations. We do not consider multi-hop citations.
-                    # Remove citations in the source to avoid confusion.
-                    data["snippets"][i] = ArticleTextProcessing.remove_citations(
-                        data["snippets"][i]
-                    )
-                storm_info = Information.from_dict(data)
-                storm_info.meta["query"] = q
-                local_to_return.append(storm_info)
-            return local_to_return
-
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=self.max_thread
         ) as executor:
-            results = list(executor.map(process_query, queries))
+            results = list(
+                executor.map(lambda q: self._retrieve_query(q, exclude_urls), queries)
+            )
 
         for result in results:
             to_return.extend(result)
 
         return to_return
 
+    def retrieve_batch(
+        self, queries_list: List[List[str]], exclude_urls: List[str] = []
+    ) -> List[List[Information]]:
+        """
+        Retrieve information for several independent query lists at once.
+
+        Queries shared between lists are sent to the retrieval model only once, and all queries are processed by a
+        single pool of `max_thread` workers. A query's results are copied for every list after the first that uses
+        it, so callers can update `meta` independently.
+
+        Args:
+            queries_list (List[List[str]]): One list of queries per caller.
+            exclude_urls (List[str]): URLs to exclude from the results of all queries.
+
+        Returns:
+            List[List[Information]]: The retrieved information for each query list, in the same order as
+                `retrieve` would return it for that list.
+        """
+        unique_queries = list(
+            dict.fromkeys(q for queries in queries_list for q in queries)
+        )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_thread
+        ) as executor:
+            query_to_results = dict(
+                zip(
+                    unique_queries,
+                    executor.map(
+                        lambda q: self._retrieve_query(q, exclude_urls), unique_queries
+                    ),
+                )
+            )
+
+        used_queries = set()
+        to_return = []
+        for queries in queries_list:
+            results = []
+            for q in queries:
+                if q in used_queries:
+                    results.extend(copy.deepcopy(query_to_results[q]))
+                else:
+                    used_queries.add(q)
+                    results.extend(query_to_results[q])
+            to_return.append(results)
+        return to_return
+
 
 class KnowledgeCurationModule(ABC):
     """
@@ -1,7 +1,13 @@
 from contextlib import contextmanager
+import copy
+import threading
 import time
 import pytz
 from datetime import datetime
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .interface import Information, Retriever
 
 # Define California timezone
 CALIFORNIA_TZ = pytz.timezone("America/Los_Angeles")
@@ -52,6 +58,52 @@ class EventLog:
         return self.child_events
 
 
+class RetrievalCache:
+    """
+    Run-scoped cache of retriever results keyed on the normalized query string.
+
+    Different experts often issue the same query during one run. Only queries that miss the cache are sent to the
+    retriever, in a single batched call, and cached results are returned as copies since callers mutate `meta`.
+    """
+
+    def __init__(self):
+        self._query_to_results: Dict[str, List["Information"]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def retrieve(
+        self, retriever: "Retriever", queries: List[str], exclude_urls: List[str] = []
+    ) -> List["Information"]:
+        normalized_to_query = {}
+        for query in queries:
+            normalized_to_query.setdefault(self.normalize(query), query)
+        with self._lock:
+            missing = [
+                query
+                for normalized, query in normalized_to_query.items()
+                if normalized not in self._query_to_results
+            ]
+        if missing:
+            fetched = {self.normalize(query): [] for query in missing}
+            for storm_info in retriever.retrieve(missing, exclude_urls=exclude_urls):
+                fetched[self.normalize(storm_info.meta["query"])].append(storm_info)
+            with self._lock:
+                self._query_to_results.update(fetched)
+        with self._lock:
+            return [
+                copy.deepcopy(storm_info)
+                for normalized in normalized_to_query
+                for storm_info in self._query_to_results[normalized]
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._query_to_results.clear()
+
+
 class LoggingWrapper:
     def __init__(self, lm_config):
         self.logging_dict = {}
@@ -59,6 +111,7 @@ class LoggingWrapper:
         self.current_pipeline_stage = None
         self.event_stack = []
         self.pipeline_stage_active = False
+        self.retrieval_cache = RetrievalCache()
 
     def _pipeline_stage_start(self, pipeline_stage: str):
         if self.pipeline_stage_active:
@@ -209,4 +262,5 @@ class LoggingWrapper:
             }
         if reset_logging:
             self.logging_dict.clear()
+            self.retrieval_cache.clear()
         return log_dump
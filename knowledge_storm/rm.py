@@ -1,16 +1,12 @@
 import logging
 import os
-from typing import Callable, Union, List
+from typing import Callable, Dict, Union, List
 
 import backoff
 import dspy
 import requests
 from dsp import backoff_hdlr, giveup_hdlr
 
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_qdrant import Qdrant
-from qdrant_client import QdrantClient
-
 from .utils import WebPageHelper
 
 
@@ -215,6 +211,9 @@ class VectorRM(dspy.Retrieve):
         if not embedding_model:
             raise ValueError("Please provide an embedding model.")
 
+        # Imported lazily so that only VectorRM users pay for loading the embedding and Qdrant stacks.
+        from langchain_huggingface import HuggingFaceEmbeddings
+
         model_kwargs = {"device": device}
         encode_kwargs = {"normalize_embeddings": True}
         self.model = HuggingFaceEmbeddings(
@@ -234,6 +233,8 @@ class VectorRM(dspy.Retrieve):
         if self.client is None:
             raise ValueError("Qdrant client is not initialized.")
         if self.client.collection_exists(collection_name=f"{self.collection_name}"):
+            from langchain_qdrant import Qdrant
+
             print(
                 f"Collection {self.collection_name} exists. Loading the collection..."
             )
@@ -263,6 +264,8 @@ class VectorRM(dspy.Retrieve):
             raise ValueError("Please provide a url for the Qdrant server.")
 
         try:
+            from qdrant_client import QdrantClient
+
             self.client = QdrantClient(url=url, api_key=api_key)
             self._check_collection()
         except Exception as e:
@@ -279,6 +282,8 @@ class VectorRM(dspy.Retrieve):
             raise ValueError("Please provide a folder path.")
 
         try:
+            from qdrant_client import QdrantClient
+
             self.client = QdrantClient(path=vector_store_path)
             self._check_collection()
         except Exception as e:
@@ -1228,3 +1233,78 @@ class AzureAISearch(dspy.Retrieve):
                 logging.error(f"Error occurs when searching query {query}: {e}")
 
         return collected_results
+
+
+RETRIEVER_REGISTRY: Dict[str, Callable[..., dspy.Retrieve]] = {}
+
+
+def register_retriever(name: str):
+    """
+    Register a retriever factory under `name` so that runners can build it with `RETRIEVER_REGISTRY[name](k=k)`.
+
+    The factory takes the number of results `k` plus optional keyword arguments that override its defaults, and
+    returns a dspy.Retrieve. Third-party retrievers can register themselves the same way, and command line choices
+    can be derived from `RETRIEVER_REGISTRY.keys()`.
+    """
+
+    def decorator(factory: Callable[..., dspy.Retrieve]):
+        RETRIEVER_REGISTRY[name] = factory
+        return factory
+
+    return decorator
+
+
+@register_retriever("bing")
+def _create_bing_search(k: int, **kwargs):
+    return BingSearch(
+        bing_search_api_key=os.getenv("BING_SEARCH_API_KEY"), k=k, **kwargs
+    )
+
+
+@register_retriever("you")
+def _create_you_rm(k: int, **kwargs):
+    return YouRM(ydc_api_key=os.getenv("YDC_API_KEY"), k=k, **kwargs)
+
+
+@register_retriever("brave")
+def _create_brave_rm(k: int, **kwargs):
+    return BraveRM(brave_search_api_key=os.getenv("BRAVE_API_KEY"), k=k, **kwargs)
+
+
+@register_retriever("duckduckgo")
+def _create_duckduckgo_search_rm(k: int, **kwargs):
+    return DuckDuckGoSearchRM(k=k, **{"safe_search": "On", "region": "us-en", **kwargs})
+
+
+@register_retriever("serper")
+def _create_serper_rm(k: int, **kwargs):
+    return SerperRM(
+        serper_search_api_key=os.getenv("SERPER_API_KEY"),
+        k=k,
+        **{"query_params": {"autocorrect": True, "num": 10, "page": 1}, **kwargs},
+    )
+
+
+@register_retriever("tavily")
+def _create_tavily_search_rm(k: int, **kwargs):
+    return TavilySearchRM(
+        tavily_search_api_key=os.getenv("TAVILY_API_KEY"),
+        k=k,
+        **{"include_raw_content": True, **kwargs},
+    )
+
+
+@register_retriever("searxng")
+def _create_searxng(k: int, **kwargs):
+    return SearXNG(
+        searxng_api_key=os.getenv("SEARXNG_API_KEY"),
+        k=k,
+        **{"searxng_api_url": os.getenv("SEARXNG_API_URL"), **kwargs},
+    )
+
+
+@register_retriever("azure_ai_search")
+def _create_azure_ai_search(k: int, **kwargs):
+    return AzureAISearch(
+        azure_ai_search_api_key=os.getenv("AZURE_AI_SEARCH_API_KEY"), k=k, **kwargs
+    )
@@ -0,0 +1,52 @@
+import atexit
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Size of the shared executor. Stages that fan out on it cannot run more than this many tasks at once.
+DEFAULT_MAX_WORKERS = 32
+
+_global_executor: Optional[ThreadPoolExecutor] = None
+_global_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _mark_global_worker():
+    _worker_state.in_global_executor = True
+
+
+def get_global_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide ThreadPoolExecutor shared by pipeline stages.
+
+    The executor is created on first use with `DEFAULT_MAX_WORKERS` threads and reused afterwards, so stages that
+    fan out LM calls do not pay for spinning up and tearing down their own threads. Callers cap their own
+    concurrency with a semaphore. Use `fan_out_executor` instead when blocking on the submitted futures.
+    """
+    global _global_executor
+    with _global_executor_lock:
+        if _global_executor is None:
+            _global_executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS,
+                thread_name_prefix="storm",
+                initializer=_mark_global_worker,
+            )
+            atexit.register(_global_executor.shutdown)
+        return _global_executor
+
+
+@contextmanager
+def fan_out_executor(max_workers: int) -> Iterator[Executor]:
+    """
+    Yield an executor for a fan-out whose caller blocks on the submitted futures.
+
+    This is the shared executor, unless the caller itself runs on one of its worker threads: waiting there on
+    other tasks of the same pool deadlocks once every worker is waiting, so a private pool of `max_workers` threads
+    is used instead.
+    """
+    if getattr(_worker_state, "in_global_executor", False):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield executor
+    else:
+        yield get_global_executor()
@@ -167,6 +167,48 @@ class STORMWikiRunnerArguments:
             "Consider reducing it if keep getting 'Exceed rate limit' error when calling LM API."
         },
     )
+    polish_chunk_size: Optional[int] = field(
+        default=3000,
+        metadata={
+            "help": "Articles longer than this many words are polished section by section in parallel when "
+            "removing duplicates. Set to None to always polish the whole article in one LM call."
+        },
+    )
+    cache_dir: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": "Directory of the semantic caches used when STORM_SEMANTIC_CACHE=1. "
+            "Defaults to ~/.cache/storm/semantic."
+        },
+    )
+    query_dedup_threshold: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": "Cosine similarity above which search queries of the same turn are considered paraphrases "
+            "and searched only once. Set to None to only drop queries that are identical up to case and whitespace."
+        },
+    )
+    checkpoint_path: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": "JSONL file that finished simulated conversations are appended to, so an interrupted "
+            "knowledge curation run can resume. Set to None to disable checkpointing."
+        },
+    )
+    max_no_info_streak: int = field(
+        default=2,
+        metadata={
+            "help": "Stop a simulated conversation after this many consecutive turns without search results. "
+            "Set to 0 to disable."
+        },
+    )
+    repeated_question_threshold: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": "Stop a simulated conversation when the cosine similarity between two consecutive questions "
+            "reaches this value. Set to None to disable."
+        },
+    )
 
 
 class STORMWikiRunner(Engine):
@@ -181,7 +223,7 @@ class STORMWikiRunner(Engine):
 
         self.retriever = Retriever(rm=rm, max_thread=self.args.max_thread_num)
         storm_persona_generator = StormPersonaGenerator(
-            self.lm_configs.question_asker_lm
+            self.lm_configs.question_asker_lm, cache_dir=self.args.cache_dir
         )
         self.storm_knowledge_curation_module = StormKnowledgeCurationModule(
             retriever=self.retriever,
@@ -192,6 +234,11 @@ class STORMWikiRunner(Engine):
             search_top_k=self.args.search_top_k,
             max_conv_turn=self.args.max_conv_turn,
             max_thread_num=self.args.max_thread_num,
+            cache_dir=self.args.cache_dir,
+            query_dedup_threshold=self.args.query_dedup_threshold,
+            checkpoint_path=self.args.checkpoint_path,
+            max_no_info_streak=self.args.max_no_info_streak,
+            repeated_question_threshold=self.args.repeated_question_threshold,
         )
         self.storm_outline_generation_module = StormOutlineGenerationModule(
             outline_gen_lm=self.lm_configs.outline_gen_lm
@@ -204,6 +251,8 @@ class STORMWikiRunner(Engine):
         self.storm_article_polishing_module = StormArticlePolishingModule(
             article_gen_lm=self.lm_configs.article_gen_lm,
             article_polish_lm=self.lm_configs.article_polish_lm,
+            polish_chunk_size=self.args.polish_chunk_size,
+            max_thread_num=self.args.max_thread_num,
         )
 
         self.lm_configs.init_check()
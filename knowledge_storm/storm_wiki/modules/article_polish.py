@@ -1,12 +1,17 @@
-import copy
-from typing import Union
+import re
+import threading
+from typing import Optional, Union
 
 import dspy
 
 from .storm_dataclass import StormArticle
+from ...cache import cached_predict, get_llm_cache
 from ...interface import ArticlePolishingModule
+from ...runtime import fan_out_executor
 from ...utils import ArticleTextProcessing
 
+_LEAD_SECTION_RE = re.compile(r"The lead section:\s*(.*)", re.S)
+
 
 class StormArticlePolishingModule(ArticlePolishingModule):
     """
@@ -18,12 +23,23 @@ class StormArticlePolishingModule(ArticlePolishingModule):
         self,
         article_gen_lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
         article_polish_lm: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        polish_chunk_size: Optional[int] = 3000,
+        max_thread_num: int = 8,
     ):
+        """
+        Args:
+            polish_chunk_size (Optional[int]): Drafts longer than this many words are polished one top-level
+                section at a time in parallel instead of in a single LM call. None disables chunking.
+            max_thread_num (int): Maximum number of threads for parallel polishing.
+        """
         self.article_gen_lm = article_gen_lm
         self.article_polish_lm = article_polish_lm
 
         self.polish_page = PolishPageModule(
-            write_lead_engine=self.article_gen_lm, polish_engine=self.article_polish_lm
+            write_lead_engine=self.article_gen_lm,
+            polish_engine=self.article_polish_lm,
+            polish_chunk_size=polish_chunk_size,
+            max_thread_num=max_thread_num,
         )
 
     def polish_article(
@@ -47,7 +63,7 @@ class StormArticlePolishingModule(ArticlePolishingModule):
         polished_article_dict = ArticleTextProcessing.parse_article_into_dict(
             polished_article
         )
-        polished_article = copy.deepcopy(draft_article)
+        polished_article = draft_article.clone_shallow()
         polished_article.insert_or_create_section(article_dict=polished_article_dict)
         polished_article.post_processing()
         return polished_article
@@ -77,26 +93,80 @@ class PolishPageModule(dspy.Module):
         self,
         write_lead_engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
         polish_engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        polish_chunk_size: Optional[int] = None,
+        max_thread_num: int = 8,
     ):
         super().__init__()
         self.write_lead_engine = write_lead_engine
         self.polish_engine = polish_engine
+        self.polish_chunk_size = polish_chunk_size
+        self.max_thread_num = max_thread_num
         self.write_lead = dspy.Predict(WriteLeadSection)
         self.polish_page = dspy.Predict(PolishPage)
+        self.llm_cache = get_llm_cache("polish")
 
-    def forward(self, topic: str, draft_page: str, polish_whole_page: bool = True):
+    def _write_lead_section(self, topic: str, draft_page: str) -> str:
         # NOTE: Change show_guidelines to false to make the generation more robust to different LM families.
         with dspy.settings.context(lm=self.write_lead_engine, show_guidelines=False):
-            lead_section = self.write_lead(
-                topic=topic, draft_page=draft_page
-            ).lead_section
-            if "The lead section:" in lead_section:
-                lead_section = lead_section.split("The lead section:")[1].strip()
-        if polish_whole_page:
-            # NOTE: Change show_guidelines to false to make the generation more robust to different LM families.
-            with dspy.settings.context(lm=self.polish_engine, show_guidelines=False):
-                page = self.polish_page(draft_page=draft_page).page
-        else:
-            page = draft_page
+            lead_section = cached_predict(
+                self.llm_cache,
+                "WriteLeadSection",
+                self.write_lead_engine,
+                lambda: self.write_lead(
+                    topic=topic, draft_page=draft_page
+                ).lead_section,
+                topic=topic,
+                draft_page=draft_page,
+            )
+        match = _LEAD_SECTION_RE.search(lead_section)
+        if match:
+            lead_section = match.group(1).strip()
+        return lead_section
+
+    def _polish_page(self, draft_page: str) -> str:
+        # NOTE: Change show_guidelines to false to make the generation more robust to different LM families.
+        with dspy.settings.context(lm=self.polish_engine, show_guidelines=False):
+            return cached_predict(
+                self.llm_cache,
+                "PolishPage",
+                self.polish_engine,
+                lambda: self.polish_page(draft_page=draft_page).page,
+                draft_page=draft_page,
+            )
+
+    def _split_draft_page(self, draft_page: str):
+        """Split a long draft into its top-level sections so that each one is polished by a separate LM call."""
+        if (
+            self.polish_chunk_size is None
+            or len(draft_page.split()) <= self.polish_chunk_size
+        ):
+            return [draft_page]
+        return [
+            chunk for chunk in re.split(r"(?m)^(?=# )", draft_page) if chunk.strip()
+        ]
+
+    def forward(self, topic: str, draft_page: str, polish_whole_page: bool = True):
+        # The lead section and the polished page both only depend on the draft, so run the LM calls concurrently.
+        # dspy settings are thread-local, so each call enters its own settings context inside the worker thread.
+        chunks = self._split_draft_page(draft_page) if polish_whole_page else []
+        # the shared executor is process-wide, so cap the number of concurrent polish LM calls here
+        polish_semaphore = threading.BoundedSemaphore(self.max_thread_num)
+
+        def _polish_chunk(chunk):
+            with polish_semaphore:
+                return self._polish_page(chunk)
+
+        # one worker for the lead section plus up to max_thread_num polish calls
+        with fan_out_executor(self.max_thread_num + 1) as executor:
+            # Only the lead section needs the whole draft as context.
+            lead_future = executor.submit(self._write_lead_section, topic, draft_page)
+            chunk_futures = [executor.submit(_polish_chunk, chunk) for chunk in chunks]
+            lead_section = lead_future.result()
+            if len(chunk_futures) == 0:
+                page = draft_page
+            elif len(chunk_futures) == 1:
+                page = chunk_futures[0].result()
+            else:
+                page = "\n\n".join(future.result().strip() for future in chunk_futures)
 
         return dspy.Prediction(lead_section=lead_section, page=page)
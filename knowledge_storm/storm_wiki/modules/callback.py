@@ -17,6 +17,10 @@ class BaseCallbackHandler:
         """Run when a question asking and answering turn finishes."""
         pass
 
+    def on_dialogue_early_stop(self, persona: str, reason: str, **kwargs):
+        """Run when a conversation is stopped before reaching the maximum number of turns."""
+        pass
+
     def on_information_gathering_end(self, **kwargs):
         """Run when the information gathering finishes."""
         pass
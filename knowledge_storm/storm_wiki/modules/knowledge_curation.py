@@ -1,7 +1,11 @@
-import concurrent.futures
+import asyncio
+import copy
+import json
 import logging
 import os
-from concurrent.futures import as_completed
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Union, List, Tuple, Optional, Dict
 
 import dspy
@@ -9,18 +13,53 @@ import dspy
 from .callback import BaseCallbackHandler
 from .persona_generator import StormPersonaGenerator
 from .storm_dataclass import DialogueTurn, StormInformationTable
+from ...cache import embed_texts, get_semantic_cache
 from ...interface import KnowledgeCurationModule, Retriever, Information
 from ...utils import ArticleTextProcessing
 
 try:
-    from streamlit.runtime.scriptrunner import add_script_run_ctx
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
     streamlit_connection = True
 except ImportError as err:
     streamlit_connection = False
 
+try:
+    import fcntl
+except ImportError:
+    # advisory file locking is only available on Unix
+    fcntl = None
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
+# strips list markers, quotes and whitespace around a generated search query
+_QUERY_STRIP_RE = re.compile(r'^[-"\s]+|[-"\s]+$')
+
+
+def _dedupe_queries(
+    queries: List[str], similarity_threshold: Optional[float] = None
+) -> List[str]:
+    """
+    Remove duplicate queries while keeping the order in which they were generated.
+
+    Queries are first deduplicated on their case- and whitespace-normalized form. If `similarity_threshold` is
+    set, a query is also dropped when its embedding's cosine similarity to an already kept query reaches it.
+    """
+    normalized_to_query = {}
+    for query in queries:
+        normalized = " ".join(query.lower().split())
+        if normalized:
+            normalized_to_query.setdefault(normalized, query)
+    queries = list(normalized_to_query.values())
+    if similarity_threshold is None or len(queries) < 2:
+        return queries
+    embeddings = embed_texts(queries)
+    kept = [0]
+    for i in range(1, len(queries)):
+        if (embeddings[kept] @ embeddings[i]).max() < similarity_threshold:
+            kept.append(i)
+    return [queries[i] for i in kept]
+
 
 class ConvSimulator(dspy.Module):
     """Simulate a conversation between a Wikipedia writer with specific persona and an expert."""
@@ -33,16 +72,123 @@ class ConvSimulator(dspy.Module):
         max_search_queries_per_turn: int,
         search_top_k: int,
         max_turn: int,
+        cache_dir: Optional[str] = None,
+        query_dedup_threshold: Optional[float] = None,
+        max_no_info_streak: int = 2,
+        repeated_question_threshold: Optional[float] = None,
     ):
+        """
+        Args:
+            max_no_info_streak (int): Stop the conversation after this many consecutive turns without search
+                results. Set to 0 to disable.
+            repeated_question_threshold (Optional[float]): If set, stop the conversation when the cosine
+                similarity between two consecutive questions reaches it.
+        """
         super().__init__()
-        self.wiki_writer = WikiWriter(engine=question_asker_engine)
+        self.wiki_writer = WikiWriter(engine=question_asker_engine, cache_dir=cache_dir)
         self.topic_expert = TopicExpert(
             engine=topic_expert_engine,
             max_search_queries=max_search_queries_per_turn,
             search_top_k=search_top_k,
             retriever=retriever,
+            cache_dir=cache_dir,
+            query_dedup_threshold=query_dedup_threshold,
         )
         self.max_turn = max_turn
+        self.max_no_info_streak = max_no_info_streak
+        self.repeated_question_threshold = repeated_question_threshold
+
+    def stop_reason(self, dlg_history: List[DialogueTurn]) -> Optional[str]:
+        """Return why the conversation should stop early, or None if further turns are likely to add information."""
+        streak = self.max_no_info_streak
+        if (
+            streak > 0
+            and len(dlg_history) >= streak
+            and all(not turn.search_results for turn in dlg_history[-streak:])
+        ):
+            return f"No information was found in the last {streak} turns."
+        if self.repeated_question_threshold is not None and len(dlg_history) >= 2:
+            embeddings = embed_texts(
+                [dlg_history[-2].user_utterance, dlg_history[-1].user_utterance]
+            )
+            if embeddings[0] @ embeddings[1] >= self.repeated_question_threshold:
+                return "The last two questions are near-duplicates."
+        return None
+
+    def _stop_early(
+        self,
+        persona: str,
+        dlg_history: List[DialogueTurn],
+        callback_handler: BaseCallbackHandler,
+    ) -> bool:
+        """Return True, after logging and notifying `callback_handler`, if the conversation should stop early."""
+        reason = self.stop_reason(dlg_history)
+        if reason is None:
+            return False
+        logging.info(f"Stop the conversation of persona '{persona}' early: {reason}")
+        callback_handler.on_dialogue_early_stop(persona=persona, reason=reason)
+        return True
+
+    def next_question(
+        self, topic: str, persona: str, dlg_history: List[DialogueTurn]
+    ) -> Optional[str]:
+        """Ask the next question of the conversation, or return None if the conversation should end."""
+        user_utterance = self.wiki_writer(
+            topic=topic, persona=persona, dialogue_turns=dlg_history
+        ).question
+        if user_utterance == "":
+            logging.error("Simulated Wikipedia writer utterance is empty.")
+            return None
+        if user_utterance.startswith("Thank you so much for your help!"):
+            return None
+        return user_utterance
+
+    def answer(
+        self, topic: str, user_utterance: str, ground_truth_url: str
+    ) -> DialogueTurn:
+        """Let the topic expert answer the question and return the completed dialogue turn."""
+        expert_output = self.topic_expert(
+            topic=topic, question=user_utterance, ground_truth_url=ground_truth_url
+        )
+        return DialogueTurn(
+            agent_utterance=expert_output.answer,
+            user_utterance=user_utterance,
+            search_queries=expert_output.queries,
+            search_results=expert_output.searched_results,
+        )
+
+    def step(
+        self,
+        topic: str,
+        persona: str,
+        ground_truth_url: str,
+        dlg_history: List[DialogueTurn],
+    ) -> Optional[DialogueTurn]:
+        """Ask the next question and answer it. Return None if the Wikipedia writer ended the conversation."""
+        user_utterance = self.next_question(
+            topic=topic, persona=persona, dlg_history=dlg_history
+        )
+        if user_utterance is None:
+            return None
+        return self.answer(
+            topic=topic,
+            user_utterance=user_utterance,
+            ground_truth_url=ground_truth_url,
+        )
+
+    def end_turn(
+        self,
+        persona: str,
+        dlg_history: List[DialogueTurn],
+        dlg_turn: DialogueTurn,
+        callback_handler: BaseCallbackHandler,
+    ) -> bool:
+        """Append `dlg_turn` to `dlg_history` and return whether the conversation should continue."""
+        dlg_history.append(dlg_turn)
+        callback_handler.on_dialogue_turn_end(dlg_turn=dlg_turn)
+        if self._stop_early(persona, dlg_history, callback_handler):
+            return False
+        return len(dlg_history) < self.max_turn
 
     def forward(
         self,
@@ -57,26 +203,38 @@ class ConvSimulator(dspy.Module):
         ground_truth_url: The ground_truth_url will be excluded from search to avoid ground truth leakage in evaluation.
         """
         dlg_history: List[DialogueTurn] = []
-        for _ in range(self.max_turn):
-            user_utterance = self.wiki_writer(
-                topic=topic, persona=persona, dialogue_turns=dlg_history
-            ).question
-            if user_utterance == "":
-                logging.error("Simulated Wikipedia writer utterance is empty.")
-                break
-            if user_utterance.startswith("Thank you so much for your help!"):
+        while len(dlg_history) < self.max_turn:
+            dlg_turn = self.step(topic, persona, ground_truth_url, dlg_history)
+            if dlg_turn is None or not self.end_turn(
+                persona, dlg_history, dlg_turn, callback_handler
+            ):
                 break
-            expert_output = self.topic_expert(
-                topic=topic, question=user_utterance, ground_truth_url=ground_truth_url
-            )
-            dlg_turn = DialogueTurn(
-                agent_utterance=expert_output.answer,
-                user_utterance=user_utterance,
-                search_queries=expert_output.queries,
-                search_results=expert_output.searched_results,
+
+        return dspy.Prediction(dlg_history=dlg_history)
+
+    async def aforward(
+        self,
+        topic: str,
+        persona: str,
+        ground_truth_url: str,
+        callback_handler: BaseCallbackHandler,
+    ):
+        """
+        Async counterpart of `forward`, so that callers can simulate many conversations with `asyncio.gather`.
+
+        The LM and retriever clients are blocking, so each `step` runs in a worker thread and the event loop is
+        free between turns; dspy settings are thread-local and are entered inside the step. Arguments and return
+        value are the same as `forward`.
+        """
+        dlg_history: List[DialogueTurn] = []
+        while len(dlg_history) < self.max_turn:
+            dlg_turn = await asyncio.to_thread(
+                self.step, topic, persona, ground_truth_url, dlg_history
             )
-            dlg_history.append(dlg_turn)
-            callback_handler.on_dialogue_turn_end(dlg_turn=dlg_turn)
+            if dlg_turn is None or not self.end_turn(
+                persona, dlg_history, dlg_turn, callback_handler
+            ):
+                break
 
         return dspy.Prediction(dlg_history=dlg_history)
 
@@ -86,11 +244,16 @@ class WikiWriter(dspy.Module):
 
     The asked question will be used to start a next round of information seeking."""
 
-    def __init__(self, engine: Union[dspy.dsp.LM, dspy.dsp.HFModel]):
+    def __init__(
+        self,
+        engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        cache_dir: Optional[str] = None,
+    ):
         super().__init__()
         self.ask_question_with_persona = dspy.ChainOfThought(AskQuestionWithPersona)
         self.ask_question = dspy.ChainOfThought(AskQuestion)
         self.engine = engine
+        self.semantic_cache = get_semantic_cache("wiki_writer", cache_dir=cache_dir)
 
     def forward(
         self,
@@ -99,18 +262,27 @@ class WikiWriter(dspy.Module):
         dialogue_turns: List[DialogueTurn],
         draft_page=None,
     ):
-        conv = []
-        for turn in dialogue_turns[:-4]:
-            conv.append(
-                f"You: {turn.user_utterance}\nExpert: Omit the answer here due to space limit."
+        conv = self._render_conv(dialogue_turns, max_words=2500)
+
+        # reuse the question asked by the same persona at the same turn after a near-paraphrased last turn
+        conv_tail_embedding = None
+        if self.semantic_cache is not None:
+            conv_tail = (
+                f"{dialogue_turns[-1].user_utterance}\n{dialogue_turns[-1].agent_utterance}"
+                if len(dialogue_turns) > 0
+                else "N/A"
             )
-        for turn in dialogue_turns[-4:]:
-            conv.append(
-                f"You: {turn.user_utterance}\nExpert: {ArticleTextProcessing.remove_citations(turn.agent_utterance)}"
+            conv_tail_embedding = self.semantic_cache.embed(
+                f"{topic}\n{persona}\n{conv_tail}"
             )
-        conv = "\n".join(conv)
-        conv = conv.strip() or "N/A"
-        conv = ArticleTextProcessing.limit_word_count_preserve_newline(conv, 2500)
+            question = self.semantic_cache.lookup(
+                conv_tail_embedding,
+                match_fn=lambda meta: meta.get("topic") == topic
+                and meta.get("persona") == persona
+                and meta.get("num_turns") == len(dialogue_turns),
+            )
+            if question is not None:
+                return dspy.Prediction(question=question)
 
         with dspy.settings.context(lm=self.engine):
             if persona is not None and len(persona.strip()) > 0:
@@ -122,8 +294,45 @@ class WikiWriter(dspy.Module):
                     topic=topic, persona=persona, conv=conv
                 ).question
 
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(
+                conv_tail_embedding,
+                question,
+                meta={
+                    "topic": topic,
+                    "persona": persona,
+                    "num_turns": len(dialogue_turns),
+                },
+            )
         return dspy.Prediction(question=question)
 
+    @staticmethod
+    def _render_conv(dialogue_turns: List[DialogueTurn], max_words: int) -> str:
+        """
+        Render the conversation history, keeping only the answers of the last 4 turns.
+
+        Turns are rendered in order and rendering stops once `max_words` is reached, since the word limit keeps
+        only the beginning of the history. This bounds the work per call by the word budget rather than by the
+        length of the conversation.
+        """
+        conv = []
+        num_words = 0
+        num_recent = len(dialogue_turns) - 4
+        for i, turn in enumerate(dialogue_turns):
+            if num_words >= max_words:
+                break
+            if i < num_recent:
+                line = f"You: {turn.user_utterance}\nExpert: Omit the answer here due to space limit."
+            else:
+                line = (
+                    f"You: {turn.user_utterance}\nExpert: {turn.agent_utterance_clean}"
+                )
+            conv.append(line)
+            num_words += len(line.split())
+        conv = "\n".join(conv)
+        conv = conv.strip() or "N/A"
+        return ArticleTextProcessing.limit_word_count_preserve_newline(conv, max_words)
+
 
 class AskQuestion(dspy.Signature):
     """You are an experienced Wikipedia writer. You are chatting with an expert to get information for the topic you want to contribute. Ask good questions to get more useful information relevant to the topic.
@@ -192,6 +401,9 @@ class TopicExpert(dspy.Module):
         max_search_queries: int,
         search_top_k: int,
         retriever: Retriever,
+        cache_dir: Optional[str] = None,
+        query_dedup_threshold: Optional[float] = None,
+        max_direct_query_words: int = 8,
     ):
         super().__init__()
         self.generate_queries = dspy.Predict(QuestionToQuery)
@@ -200,45 +412,107 @@ class TopicExpert(dspy.Module):
         self.engine = engine
         self.max_search_queries = max_search_queries
         self.search_top_k = search_top_k
+        # if set, near-paraphrased queries with at least this cosine similarity are only searched once
+        self.query_dedup_threshold = query_dedup_threshold
+        # questions of at most this many words that ask a single thing are searched verbatim; 0 disables this
+        self.max_direct_query_words = max_direct_query_words
+        self.semantic_cache = get_semantic_cache("topic_expert", cache_dir=cache_dir)
+
+    def _is_direct_query(self, question: str) -> bool:
+        question = question.strip()
+        return (
+            0 < len(question.split()) <= self.max_direct_query_words
+            and " and " not in question.lower()
+            and "?" not in question[:-1]
+        )
 
-    def forward(self, topic: str, question: str, ground_truth_url: str):
+    def generate_search_queries(self, topic: str, question: str) -> List[str]:
+        if self._is_direct_query(question):
+            # A short, single-part question is already a usable search query, so skip the LM call.
+            logging.info(f"Use the question as the search query directly: {question}")
+            return [question.strip()]
         with dspy.settings.context(lm=self.engine, show_guidelines=False):
             # Identify: Break down question into queries.
             queries = self.generate_queries(topic=topic, question=question).queries
-            queries = [
-                q.replace("-", "").strip().strip('"').strip('"').strip()
-                for q in queries.split("\n")
-            ]
-            queries = queries[: self.max_search_queries]
-            # Search
-            searched_results: List[Information] = self.retriever.retrieve(
-                list(set(queries)), exclude_urls=[ground_truth_url]
+        queries = [_QUERY_STRIP_RE.sub("", q) for q in queries.split("\n")]
+        return queries[: self.max_search_queries]
+
+    def search_batch(
+        self, queries_list: List[List[str]], ground_truth_url: str
+    ) -> List[List[Information]]:
+        """Search with the queries of several questions in one batched retriever call."""
+        return self.retriever.retrieve_batch(
+            [
+                _dedupe_queries(queries, self.query_dedup_threshold)
+                for queries in queries_list
+            ],
+            exclude_urls=[ground_truth_url],
+        )
+
+    def prepare(
+        self, topic: str, question: str, ground_truth_url: str
+    ) -> Tuple[List[str], List[Information]]:
+        """Generate search queries for the question and retrieve information with them."""
+        queries = self.generate_search_queries(topic=topic, question=question)
+        # Search
+        searched_results = self.search_batch([queries], ground_truth_url)[0]
+        return queries, searched_results
+
+    def finalize(
+        self, topic: str, question: str, searched_results: List[Information]
+    ) -> str:
+        """Generate the answer to the question from the retrieved information."""
+        if len(searched_results) == 0:
+            # When no information is found, the expert shouldn't hallucinate.
+            return "Sorry, I cannot find information for this question. Please ask another question."
+        # Evaluate: Simplify this part by directly using the top 1 snippet.
+        info = "\n\n".join(
+            "\n".join(f"[{n + 1}]: {s}" for s in r.snippets[:1])
+            for n, r in enumerate(searched_results)
+        )
+
+        info = ArticleTextProcessing.limit_word_count_preserve_newline(info, 1000)
+
+        try:
+            with dspy.settings.context(lm=self.engine, show_guidelines=False):
+                answer = self.answer_question(
+                    topic=topic, conv=question, info=info
+                ).answer
+            return ArticleTextProcessing.remove_uncompleted_sentences_with_citations(
+                answer
             )
-            if len(searched_results) > 0:
-                # Evaluate: Simplify this part by directly using the top 1 snippet.
-                info = ""
-                for n, r in enumerate(searched_results):
-                    info += "\n".join(f"[{n + 1}]: {s}" for s in r.snippets[:1])
-                    info += "\n\n"
-
-                info = ArticleTextProcessing.limit_word_count_preserve_newline(
-                    info, 1000
-                )
+        except Exception as e:
+            logging.error(f"Error occurs when generating answer: {e}")
+            return "Sorry, I cannot answer this question. Please ask another question."
 
-                try:
-                    answer = self.answer_question(
-                        topic=topic, conv=question, info=info
-                    ).answer
-                    answer = ArticleTextProcessing.remove_uncompleted_sentences_with_citations(
-                        answer
-                    )
-                except Exception as e:
-                    logging.error(f"Error occurs when generating answer: {e}")
-                    answer = "Sorry, I cannot answer this question. Please ask another question."
-            else:
-                # When no information is found, the expert shouldn't hallucinate.
-                answer = "Sorry, I cannot find information for this question. Please ask another question."
+    def forward(self, topic: str, question: str, ground_truth_url: str):
+        # reuse queries, search results and answer of a near-paraphrased question on the same topic
+        question_embedding = None
+        if self.semantic_cache is not None:
+            question_embedding = self.semantic_cache.embed(f"{topic}\n{question}")
+            cached = self.semantic_cache.lookup(
+                question_embedding,
+                match_fn=lambda meta: meta.get("topic") == topic
+                and meta.get("ground_truth_url") == ground_truth_url,
+            )
+            if cached is not None:
+                queries, searched_results, answer = copy.deepcopy(cached)
+                return dspy.Prediction(
+                    queries=queries, searched_results=searched_results, answer=answer
+                )
+        queries, searched_results = self.prepare(
+            topic=topic, question=question, ground_truth_url=ground_truth_url
+        )
+        answer = self.finalize(
+            topic=topic, question=question, searched_results=searched_results
+        )
 
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(
+                question_embedding,
+                copy.deepcopy((queries, searched_results, answer)),
+                meta={"topic": topic, "ground_truth_url": ground_truth_url},
+            )
         return dspy.Prediction(
             queries=queries, searched_results=searched_results, answer=answer
         )
@@ -259,10 +533,26 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
         search_top_k: int,
         max_conv_turn: int,
         max_thread_num: int,
+        cache_dir: Optional[str] = None,
+        query_dedup_threshold: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        max_no_info_streak: int = 2,
+        repeated_question_threshold: Optional[float] = None,
     ):
         """
         Store args and finish initialization.
+
+        `cache_dir` is where the semantic caches of simulated conversations are persisted when the
+        `STORM_SEMANTIC_CACHE` environment variable is set to 1. Defaults to `~/.cache/storm/semantic`.
+        `query_dedup_threshold`, if set, is the cosine similarity above which search queries of the same turn
+        are considered paraphrases and searched only once.
+        `checkpoint_path`, if set, is a JSONL file that every finished conversation is appended to. Conversations
+        found there for the same topic and persona are reused instead of simulated again, so an interrupted run
+        can resume.
+        `max_no_info_streak` and `repeated_question_threshold` control when a simulated conversation stops early;
+        see `ConvSimulator`.
         """
+        self.checkpoint_path = checkpoint_path
         self.retriever = retriever
         self.persona_generator = persona_generator
         self.conv_simulator_lm = conv_simulator_lm
@@ -276,8 +566,59 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
             max_search_queries_per_turn=max_search_queries_per_turn,
             search_top_k=search_top_k,
             max_turn=max_conv_turn,
+            cache_dir=cache_dir,
+            query_dedup_threshold=query_dedup_threshold,
+            max_no_info_streak=max_no_info_streak,
+            repeated_question_threshold=repeated_question_threshold,
         )
 
+    def _load_checkpoint(self, topic: str) -> Dict[str, List[List[DialogueTurn]]]:
+        """Load the finished conversations of `topic` from the checkpoint file, grouped by persona."""
+        persona_to_conversations = {}
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return persona_to_conversations
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line may be incomplete if the process died while writing it
+                    logging.warning(
+                        f"Skip a malformed line in checkpoint {self.checkpoint_path}."
+                    )
+                    continue
+                if record["topic"] != topic:
+                    continue
+                persona_to_conversations.setdefault(record["perspective"], []).append(
+                    [DialogueTurn(**turn) for turn in record["dlg_turns"]]
+                )
+        return persona_to_conversations
+
+    def _append_checkpoint(
+        self, topic: str, persona: str, dlg_history: List[DialogueTurn]
+    ):
+        """Durably append a finished conversation to the checkpoint file."""
+        if self.checkpoint_path is None:
+            return
+        record = {
+            "topic": topic,
+            "perspective": persona,
+            "dlg_turns": [turn.log() for turn in dlg_history],
+        }
+        checkpoint_dir = os.path.dirname(self.checkpoint_path)
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
     def _get_considered_personas(self, topic: str, max_num_persona) -> List[str]:
         return self.persona_generator.generate_persona(
             topic=topic, max_num_persona=max_num_persona
@@ -296,10 +637,14 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
         and collects their dialog histories. The dialog history of each conversation is cleaned
         up before being stored.
 
+        Every question and every answer of every conversation is a separate task on one thread pool,
+        and the next step of a conversation is submitted as soon as its previous step completes. This
+        keeps all `max_thread_num` workers busy even when there are more personas than workers. Conversations
+        whose search queries are ready at the same time are retrieved with one `Retriever.retrieve_batch` call.
+
         Parameters:
-            conv_simulator (callable): The function to simulate conversations. It must accept four
-                parameters: `topic`, `ground_truth_url`, `persona`, and `callback_handler`, and return
-                an object that has a `dlg_history` attribute.
+            conv_simulator (ConvSimulator): The conversation simulator. Its `next_question` step and the
+                steps of its topic expert are scheduled turn by turn.
             topic (str): The topic of conversation for the simulations.
             ground_truth_url (str): The URL to the ground truth data related to the conversation topic.
             considered_personas (list): A list of personas under which the conversation simulations
@@ -313,35 +658,142 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
         """
 
         conversations = []
+        # conversations are tracked by index because personas are not guaranteed to be unique
+        dlg_histories = [[] for _ in considered_personas]
 
-        def run_conv(persona):
-            return conv_simulator(
-                topic=topic,
-                ground_truth_url=ground_truth_url,
-                persona=persona,
-                callback_handler=callback_handler,
-            )
+        initializer = None
+        if streamlit_connection:
+            # Ensure the logging context is correct when connecting with Streamlit frontend.
+            script_run_ctx = get_script_run_ctx()
+
+            def initializer():
+                add_script_run_ctx(threading.current_thread(), script_run_ctx)
 
         max_workers = min(self.max_thread_num, len(considered_personas))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_persona = {
-                executor.submit(run_conv, persona): persona
-                for persona in considered_personas
-            }
-
-            if streamlit_connection:
-                # Ensure the logging context is correct when connecting with Streamlit frontend.
-                for t in executor._threads:
-                    add_script_run_ctx(t)
-
-            for future in as_completed(future_to_persona):
-                persona = future_to_persona[future]
-                conv = future.result()
-                conversations.append(
-                    (persona, ArticleTextProcessing.clean_up_citation(conv).dlg_history)
+        restored_conversations = self._load_checkpoint(topic)
+
+        def finish_conv(conv_idx):
+            persona = considered_personas[conv_idx]
+            conv = dspy.Prediction(dlg_history=dlg_histories[conv_idx])
+            dlg_history = ArticleTextProcessing.clean_up_citation(conv).dlg_history
+            conversations.append((persona, dlg_history))
+            self._append_checkpoint(topic, persona, dlg_history)
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, initializer=initializer
+        ) as executor:
+            topic_expert = conv_simulator.topic_expert
+            # A semantic cache hit skips the whole expert step, so only batch retrieval when caching is off.
+            batch_retrieval = topic_expert.semantic_cache is None
+            # maps each in-flight future to its step and the state needed to continue the conversation
+            pending = {}
+            awaiting_retrieval = []
+
+            def submit(step, fn, *state, **kwargs):
+                pending[executor.submit(fn, **kwargs)] = (step, *state)
+
+            def submit_question(conv_idx):
+                submit(
+                    "question",
+                    conv_simulator.next_question,
+                    conv_idx,
+                    topic=topic,
+                    persona=considered_personas[conv_idx],
+                    dlg_history=dlg_histories[conv_idx],
                 )
 
+            def end_turn(conv_idx, dlg_turn):
+                if conv_simulator.end_turn(
+                    considered_personas[conv_idx],
+                    dlg_histories[conv_idx],
+                    dlg_turn,
+                    callback_handler,
+                ):
+                    submit_question(conv_idx)
+                else:
+                    finish_conv(conv_idx)
+
+            for conv_idx, persona in enumerate(considered_personas):
+                if restored_conversations.get(persona):
+                    conversations.append(
+                        (persona, restored_conversations[persona].pop(0))
+                    )
+                elif conv_simulator.max_turn > 0:
+                    submit_question(conv_idx)
+                else:
+                    finish_conv(conv_idx)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, *state = pending.pop(future)
+                    if step == "question":
+                        (conv_idx,) = state
+                        user_utterance = future.result()
+                        if user_utterance is None:
+                            finish_conv(conv_idx)
+                        elif batch_retrieval:
+                            submit(
+                                "queries",
+                                topic_expert.generate_search_queries,
+                                conv_idx,
+                                user_utterance,
+                                topic=topic,
+                                question=user_utterance,
+                            )
+                        else:
+                            submit(
+                                "answer",
+                                conv_simulator.answer,
+                                conv_idx,
+                                topic=topic,
+                                user_utterance=user_utterance,
+                                ground_truth_url=ground_truth_url,
+                            )
+                    elif step == "queries":
+                        awaiting_retrieval.append((*state, future.result()))
+                    elif step == "retrieve":
+                        (batch,) = state
+                        for (
+                            conv_idx,
+                            user_utterance,
+                            queries,
+                        ), searched_results in zip(batch, future.result()):
+                            submit(
+                                "finalize",
+                                topic_expert.finalize,
+                                conv_idx,
+                                user_utterance,
+                                queries,
+                                searched_results,
+                                topic=topic,
+                                question=user_utterance,
+                                searched_results=searched_results,
+                            )
+                    elif step == "finalize":
+                        conv_idx, user_utterance, queries, searched_results = state
+                        dlg_turn = DialogueTurn(
+                            agent_utterance=future.result(),
+                            user_utterance=user_utterance,
+                            search_queries=queries,
+                            search_results=searched_results,
+                        )
+                        end_turn(conv_idx, dlg_turn)
+                    else:
+                        (conv_idx,) = state
+                        end_turn(conv_idx, future.result())
+                # Conversations whose queries are ready at the same time share one retriever call.
+                if awaiting_retrieval:
+                    batch, awaiting_retrieval = awaiting_retrieval, []
+                    submit(
+                        "retrieve",
+                        topic_expert.search_batch,
+                        batch,
+                        queries_list=[queries for _, _, queries in batch],
+                        ground_truth_url=ground_truth_url,
+                    )
+
         return conversations
 
     def research(
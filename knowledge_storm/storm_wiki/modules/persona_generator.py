@@ -1,20 +1,130 @@
+import atexit
 import logging
+import os
 import re
-from typing import Union, List
+import threading
+from typing import Dict, Union, List, Optional
 
 import dspy
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ...cache import DEFAULT_CACHE_ROOT, DEFAULT_EXPIRE_SECONDS, get_semantic_cache
+from ...runtime import fan_out_executor
+
+_PERSONA_LINE_RE = re.compile(r"\d+\.\s*(.*)")
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+WIKI_REQUEST_TIMEOUT = 10
+# Upper bound on the HTML read from one page; very large pages are truncated rather than fully downloaded.
+WIKI_MAX_PAGE_BYTES = 4 * 1024 * 1024
+
+# Shared session so that fetches of related Wikipedia pages reuse TCP/TLS connections. Transient failures are
+# retried with a short backoff instead of dropping the page from the persona examples.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
+    ),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+_session.headers.update(
+    {
+        "User-Agent": "knowledge-storm (https://github.com/stanford-oval/storm)",
+        "Accept-Encoding": "gzip, deflate",
+    }
+)
+atexit.register(_session.close)
+
+_toc_cache = None
+_toc_cache_lock = threading.Lock()
+
+
+def _get_toc_cache():
+    """Get the on-disk cache of Wikipedia TOCs, or None if `diskcache` is not installed."""
+    global _toc_cache
+    with _toc_cache_lock:
+        if _toc_cache is None:
+            try:
+                import diskcache
+            except ImportError:
+                return None
+            _toc_cache = diskcache.Cache(os.path.join(DEFAULT_CACHE_ROOT, "wiki_toc"))
+        return _toc_cache
 
 
 def get_wiki_page_title_and_toc(url):
-    """Get the main title and table of contents from an url of a Wikipedia page."""
+    """Get the main title and table of contents from an url of a Wikipedia page.
+
+    Results are cached on disk for 7 days when `diskcache` is installed, since table of contents rarely change.
+    """
+    cache = _get_toc_cache()
+    if cache is None:
+        return _fetch_wiki_page_title_and_toc(url)
+    result = cache.get(url, default=None)
+    if result is None:
+        result = _fetch_wiki_page_title_and_toc(url)
+        cache.set(url, result, expire=DEFAULT_EXPIRE_SECONDS)
+    return result
+
 
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, "html.parser")
+def _stream_wiki_page_headers(url):
+    """
+    Download the page in chunks and parse its h1-h6 headers while the download is in progress.
+
+    Everything parsed before a header is dropped from the tree once the header is read, so memory stays bounded by
+    the content between two headers rather than the whole page.
+
+    Returns:
+        List[Tuple[str, str]]: (tag, text) of every header in document order.
+    """
+    headers = []
+
+    def _collect_headers():
+        for _, element in parser.read_events():
+            headers.append((element.tag, "".join(element.itertext())))
+            element.clear(keep_tail=True)
+            for node in [element, *element.iterancestors()]:
+                while node.getprevious() is not None:
+                    del node.getparent()[0]
+
+    num_bytes = 0
+    with _session.get(url, timeout=WIKI_REQUEST_TIMEOUT, stream=True) as response:
+        # Only trust a charset the server declares. requests falls back to ISO-8859-1 for text/* responses, which
+        # would override the page's <meta charset>, so otherwise lxml detects the encoding from the document.
+        charset = _CHARSET_RE.search(response.headers.get("Content-Type", ""))
+        parser = etree.HTMLPullParser(
+            events=("end",),
+            tag=("h1", "h2", "h3", "h4", "h5", "h6"),
+            encoding=charset.group(1) if charset else None,
+        )
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            parser.feed(chunk)
+            _collect_headers()
+            num_bytes += len(chunk)
+            if num_bytes >= WIKI_MAX_PAGE_BYTES:
+                logging.warning(
+                    f"Truncated {url} after {num_bytes} bytes when extracting its table of contents."
+                )
+                break
+    parser.close()
+    _collect_headers()
+    return headers
+
+
+def _fetch_wiki_page_title_and_toc(url):
+    headers = _stream_wiki_page_headers(url)
 
     # Get the main title from the first h1 tag
-    main_title = soup.find("h1").text.replace("[edit]", "").strip().replace("\xa0", " ")
+    h1_texts = [text for tag, text in headers if tag == "h1"]
+    if len(h1_texts) == 0:
+        raise ValueError(f"No title found in {url}")
+    main_title = h1_texts[0].replace("[edit]", "").strip().replace("\xa0", " ")
 
     toc = ""
     levels = []
@@ -27,11 +137,12 @@ def get_wiki_page_title_and_toc(url):
     }
 
     # Start processing from h2 to exclude the main title from TOC
-    for header in soup.find_all(["h2", "h3", "h4", "h5", "h6"]):
-        level = int(
-            header.name[1]
-        )  # Extract the numeric part of the header tag (e.g., '2' from 'h2')
-        section_title = header.text.replace("[edit]", "").strip().replace("\xa0", " ")
+    for tag, text in headers:
+        if tag == "h1":
+            continue
+        # Extract the numeric part of the header tag (e.g., '2' from 'h2')
+        level = int(tag[1])
+        section_title = text.replace("[edit]", "").strip().replace("\xa0", " ")
         if section_title in excluded_sections:
             continue
 
@@ -45,6 +156,15 @@ def get_wiki_page_title_and_toc(url):
     return main_title, toc.strip()
 
 
+def _get_example(url):
+    try:
+        title, toc = get_wiki_page_title_and_toc(url)
+        return f"Title: {title}\nTable of Contents: {toc}"
+    except Exception as e:
+        logging.error(f"Error occurs when processing {url}: {e}")
+        return None
+
+
 class FindRelatedTopic(dspy.Signature):
     """I'm writing a Wikipedia page for a topic mentioned below. Please identify and recommend some Wikipedia pages on closely related subjects. I'm looking for examples that provide insights into interesting aspects commonly associated with this topic, or examples that help me understand the typical content and structure included in Wikipedia pages for similar topics.
     Please list the urls in separate lines."""
@@ -68,13 +188,37 @@ class GenPersona(dspy.Signature):
 class CreateWriterWithPersona(dspy.Module):
     """Discover different perspectives of researching the topic by reading Wikipedia pages of related topics."""
 
-    def __init__(self, engine: Union[dspy.dsp.LM, dspy.dsp.HFModel]):
+    def __init__(
+        self,
+        engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        cache_dir: Optional[str] = None,
+    ):
         super().__init__()
         self.find_related_topic = dspy.ChainOfThought(FindRelatedTopic)
         self.gen_persona = dspy.ChainOfThought(GenPersona)
         self.engine = engine
+        self.semantic_cache = get_semantic_cache(
+            "persona", threshold=0.97, cache_dir=cache_dir
+        )
+
+    def invalidate(self, topic: str):
+        """Drop the cached personas of `topic` so that the next call generates them afresh."""
+        if self.semantic_cache is not None:
+            self.semantic_cache.remove(lambda meta: meta.get("topic") == topic)
 
     def forward(self, topic: str, draft=None):
+        # reuse the personas generated for a near-paraphrased topic
+        topic_embedding = None
+        if self.semantic_cache is not None:
+            topic_embedding = self.semantic_cache.embed(topic)
+            cached = self.semantic_cache.lookup(topic_embedding)
+            if cached is not None:
+                personas, related_topics = cached
+                return dspy.Prediction(
+                    personas=list(personas),
+                    raw_personas_output=list(personas),
+                    related_topics=related_topics,
+                )
         with dspy.settings.context(lm=self.engine):
             # Get section names from wiki pages of relevant topics for inspiration.
             related_topics = self.find_related_topic(topic=topic).related_topics
@@ -82,14 +226,13 @@ class CreateWriterWithPersona(dspy.Module):
             for s in related_topics.split("\n"):
                 if "http" in s:
                     urls.append(s[s.find("http") :])
-            examples = []
-            for url in urls:
-                try:
-                    title, toc = get_wiki_page_title_and_toc(url)
-                    examples.append(f"Title: {title}\nTable of Contents: {toc}")
-                except Exception as e:
-                    logging.error(f"Error occurs when processing {url}: {e}")
-                    continue
+            # The pages are independent, so fetch them concurrently and keep the original order.
+            with fan_out_executor(max(1, len(urls))) as executor:
+                examples = [
+                    example
+                    for example in executor.map(_get_example, urls)
+                    if example is not None
+                ]
             if len(examples) == 0:
                 examples.append("N/A")
             gen_persona_output = self.gen_persona(
@@ -98,12 +241,18 @@ class CreateWriterWithPersona(dspy.Module):
 
         personas = []
         for s in gen_persona_output.split("\n"):
-            match = re.search(r"\d+\.\s*(.*)", s)
+            match = _PERSONA_LINE_RE.search(s)
             if match:
                 personas.append(match.group(1))
 
         sorted_personas = personas
 
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(
+                topic_embedding,
+                (list(personas), related_topics),
+                meta={"topic": topic},
+            )
         return dspy.Prediction(
             personas=personas,
             raw_personas_output=sorted_personas,
@@ -126,10 +275,27 @@ class StormPersonaGenerator:
     Args:
         engine (Union[dspy.dsp.LM, dspy.dsp.HFModel]): The underlying engine used for generating
             personas. It must be an instance of either `dspy.dsp.LM` or `dspy.dsp.HFModel`.
+        cache_dir (Optional[str]): Directory of the semantic persona cache, used when the
+            `STORM_SEMANTIC_CACHE` environment variable is set to 1.
     """
 
-    def __init__(self, engine: Union[dspy.dsp.LM, dspy.dsp.HFModel]):
-        self.create_writer_with_persona = CreateWriterWithPersona(engine=engine)
+    def __init__(
+        self,
+        engine: Union[dspy.dsp.LM, dspy.dsp.HFModel],
+        cache_dir: Optional[str] = None,
+    ):
+        self.create_writer_with_persona = CreateWriterWithPersona(
+            engine=engine, cache_dir=cache_dir
+        )
+        # exact-match cache of generated personas per topic, in front of the semantic cache
+        self._topic_to_personas: Dict[str, List[str]] = {}
+        self._topic_to_personas_lock = threading.Lock()
+
+    def invalidate(self, topic: str):
+        """Drop the cached personas of `topic`, both in memory and in the semantic cache."""
+        with self._topic_to_personas_lock:
+            self._topic_to_personas.pop(topic, None)
+        self.create_writer_with_persona.invalidate(topic)
 
     def generate_persona(self, topic: str, max_num_persona: int = 3) -> List[str]:
         """
@@ -148,7 +314,12 @@ class StormPersonaGenerator:
             List[str]: A list of persona descriptions, including the default 'Basic fact writer' persona
                 and up to `max_num_persona` additional personas generated based on the topic.
         """
-        personas = self.create_writer_with_persona(topic=topic)
+        with self._topic_to_personas_lock:
+            personas = self._topic_to_personas.get(topic)
+        if personas is None:
+            personas = self.create_writer_with_persona(topic=topic).personas
+            with self._topic_to_personas_lock:
+                self._topic_to_personas[topic] = personas
         default_persona = "Basic fact writer: Basic fact writer focusing on broadly covering the basic facts about the topic."
-        considered_personas = [default_persona] + personas.personas[:max_num_persona]
+        considered_personas = [default_persona] + personas[:max_num_persona]
         return considered_personas
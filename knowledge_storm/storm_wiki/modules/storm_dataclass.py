@@ -23,6 +23,7 @@ class DialogueTurn:
         self.user_utterance = user_utterance
         self.search_queries = search_queries
         self.search_results = search_results
+        self._agent_utterance_clean: Optional[Tuple[str, str]] = None
 
         if self.search_results:
             for idx in range(len(self.search_results)):
@@ -31,6 +32,23 @@ class DialogueTurn:
                         self.search_results[idx]
                     )
 
+    @property
+    def agent_utterance_clean(self) -> str:
+        """
+        The agent utterance with citations removed.
+
+        Computed once and reused across turns; recomputed only if `agent_utterance` has been reassigned since.
+        """
+        if (
+            self._agent_utterance_clean is None
+            or self._agent_utterance_clean[0] is not self.agent_utterance
+        ):
+            self._agent_utterance_clean = (
+                self.agent_utterance,
+                ArticleTextProcessing.remove_citations(self.agent_utterance),
+            )
+        return self._agent_utterance_clean[1]
+
     def log(self):
         """
         Returns a json object that contains all information inside `self`
@@ -501,6 +519,25 @@ class StormArticle(Article):
         article.reference = references
         return article
 
+    def clone_shallow(self) -> "StormArticle":
+        """
+        Copy the section tree and the reference index maps, sharing the Information objects they point to.
+
+        Much cheaper than `copy.deepcopy` on large articles. The clone can be edited with
+        `insert_or_create_section` and `post_processing` without affecting `self`, but the shared
+        Information objects must not be mutated in place.
+        """
+
+        def clone_node(node: ArticleSectionNode) -> ArticleSectionNode:
+            new_node = copy.copy(node)
+            new_node.children = [clone_node(child) for child in node.children]
+            return new_node
+
+        article = copy.copy(self)
+        article.root = clone_node(self.root)
+        article.reference = {key: dict(value) for key, value in self.reference.items()}
+        return article
+
     def post_processing(self):
         self.prune_empty_nodes()
         self.reorder_reference_index()
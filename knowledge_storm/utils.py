@@ -7,23 +7,29 @@ import re
 import regex
 import sys
 import time
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
 import httpx
-import pandas as pd
 import toml
-from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_qdrant import Qdrant
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from qdrant_client import QdrantClient, models
-from tqdm import tqdm
 from trafilatura import extract
 
 from .lm import OpenAIModel
 
+if TYPE_CHECKING:
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from qdrant_client import QdrantClient
+
 logging.getLogger("httpx").setLevel(logging.WARNING)  # Disable INFO logging for httpx.
 
+# Citation patterns used by ArticleTextProcessing on every conversation turn; compiled once at import.
+_CITATION_RE = re.compile(r"\[\d+(?:,\s*\d+)*\]")
+_SINGLE_CITATION_RE = re.compile(r"\[\d+\]")
+_CITATION_INDEX_RE = re.compile(r"\[(\d+)\]")
+_GROUPED_CITATION_RE = re.compile(r"\[([0-9, ]+)\]")
+_CITATION_RUN_RE = re.compile(r"(\[\d+\])+")
+_SENTENCE_END_RE = re.compile(r"([.!?])\s*(\[\d+\])?\s*")
+
 
 def truncate_filename(filename, max_length=125):
     """Truncate filename to max_length to ensure the filename won't exceed the file system limit.
@@ -72,9 +78,12 @@ class QdrantVectorStoreManager:
 
     @staticmethod
     def _check_create_collection(
-        client: QdrantClient, collection_name: str, model: HuggingFaceEmbeddings
+        client: "QdrantClient", collection_name: str, model: "HuggingFaceEmbeddings"
     ):
         """Check if the Qdrant collection exists and create it if it does not."""
+        from langchain_qdrant import Qdrant
+        from qdrant_client import models
+
         if client is None:
             raise ValueError("Qdrant client is not initialized.")
         if client.collection_exists(collection_name=f"{collection_name}"):
@@ -103,7 +112,7 @@ class QdrantVectorStoreManager:
 
     @staticmethod
     def _init_online_vector_db(
-        url: str, api_key: str, collection_name: str, model: HuggingFaceEmbeddings
+        url: str, api_key: str, collection_name: str, model: "HuggingFaceEmbeddings"
     ):
         """Initialize the Qdrant client that is connected to an online vector store with the given URL and API key.
 
@@ -118,6 +127,8 @@ class QdrantVectorStoreManager:
         if url is None:
             raise ValueError("Please provide a url for the Qdrant server.")
 
+        from qdrant_client import QdrantClient
+
         try:
             client = QdrantClient(url=url, api_key=api_key)
             return QdrantVectorStoreManager._check_create_collection(
@@ -128,7 +139,7 @@ class QdrantVectorStoreManager:
 
     @staticmethod
     def _init_offline_vector_db(
-        vector_store_path: str, collection_name: str, model: HuggingFaceEmbeddings
+        vector_store_path: str, collection_name: str, model: "HuggingFaceEmbeddings"
     ):
         """Initialize the Qdrant client that is connected to an offline vector store with the given vector store folder path.
 
@@ -138,6 +149,8 @@ class QdrantVectorStoreManager:
         if vector_store_path is None:
             raise ValueError("Please provide a folder path.")
 
+        from qdrant_client import QdrantClient
+
         try:
             client = QdrantClient(path=vector_store_path)
             return QdrantVectorStoreManager._check_create_collection(
@@ -186,6 +199,12 @@ class QdrantVectorStoreManager:
             device: Device to run the embeddings model on, can be "mps", "cuda", "cpu".
             qdrant_api_key: API key for the Qdrant server (Only required if the Qdrant server is online).
         """
+        # Imported lazily so that only vector store users pay for loading these packages.
+        import pandas as pd
+        from langchain_core.documents import Document
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from tqdm import tqdm
+
         # check if the collection name is provided
         if collection_name is None:
             raise ValueError("Please provide a collection name.")
@@ -308,22 +327,21 @@ class ArticleTextProcessing:
             str: The truncated string with word count limited to `max_word_count`, preserving complete lines.
         """
 
-        word_count = 0
-        limited_string = ""
+        remaining_words = max_word_count
+        limited_lines = []
 
-        for word in input_string.split("\n"):
-            line_words = word.split()
-            for lw in line_words:
-                if word_count < max_word_count:
-                    limited_string += lw + " "
-                    word_count += 1
-                else:
-                    break
-            if word_count >= max_word_count:
+        for line in input_string.split("\n"):
+            if remaining_words <= 0:
                 break
-            limited_string = limited_string.strip() + "\n"
+            line_words = line.split()
+            if not line_words:
+                continue
+            # take whole lines by slicing instead of concatenating word by word
+            kept_words = line_words[:remaining_words]
+            limited_lines.append(" ".join(kept_words))
+            remaining_words -= len(kept_words)
 
-        return limited_string.strip()
+        return "\n".join(limited_lines)
 
     @staticmethod
     def remove_citations(s):
@@ -339,7 +357,7 @@ class ArticleTextProcessing:
             str: The string with all citation patterns removed.
         """
 
-        return re.sub(r"\[\d+(?:,\s*\d+)*\]", "", s)
+        return _CITATION_RE.sub("", s)
 
     @staticmethod
     def parse_citation_indices(s):
@@ -352,7 +370,7 @@ class ArticleTextProcessing:
         Returns:
             List[int]: A list of unique citation indexes extracted from the content, in the order they appear.
         """
-        matches = re.findall(r"\[\d+\]", s)
+        matches = _SINGLE_CITATION_RE.findall(s)
         return [int(index[1:-1]) for index in matches]
 
     @staticmethod
@@ -379,15 +397,15 @@ class ArticleTextProcessing:
         # Deduplicate and sort individual groups of citations.
         def deduplicate_group(match):
             citations = match.group(0)
-            unique_citations = list(set(re.findall(r"\[\d+\]", citations)))
+            unique_citations = list(set(_SINGLE_CITATION_RE.findall(citations)))
             sorted_citations = sorted(
                 unique_citations, key=lambda x: int(x.strip("[]"))
             )
             # Return the sorted unique citations as a string
             return "".join(sorted_citations)
 
-        text = re.sub(r"\[([0-9, ]+)\]", replace_with_individual_brackets, text)
-        text = re.sub(r"(\[\d+\])+", deduplicate_group, text)
+        text = _GROUPED_CITATION_RE.sub(replace_with_individual_brackets, text)
+        text = _CITATION_RUN_RE.sub(deduplicate_group, text)
 
         # Deprecated: Remove sentence without proper ending punctuation and citations.
         # Split the text into sentences (including citations).
@@ -407,11 +425,11 @@ class ArticleTextProcessing:
         # if trailing_citations:
         #     combined_sentences += ' '.join(trailing_citations)
 
-        # Regex pattern to match sentence endings, including optional citation markers.
-        eos_pattern = r"([.!?])\s*(\[\d+\])?\s*"
-        matches = list(re.finditer(eos_pattern, text))
-        if matches:
-            last_match = matches[-1]
+        # Find the last sentence ending, including optional citation markers, without materializing all matches.
+        last_match = None
+        for last_match in _SENTENCE_END_RE.finditer(text):
+            pass
+        if last_match is not None:
             text = text[: last_match.end()].strip()
 
         return text
@@ -430,7 +448,7 @@ class ArticleTextProcessing:
             turn.agent_utterance = turn.agent_utterance.replace("Answer:", "").strip()
             try:
                 max_ref_num = max(
-                    [int(x) for x in re.findall(r"\[(\d+)\]", turn.agent_utterance)]
+                    [int(x) for x in _CITATION_INDEX_RE.findall(turn.agent_utterance)]
                 )
             except Exception as e:
                 max_ref_num = 0
@@ -566,12 +584,15 @@ class ArticleTextProcessing:
         lines = [line for line in lines if line.strip()]
         root = {"content": "", "subsections": {}}
         current_path = [(root, -1)]  # (current_dict, level)
+        # Collect content lines per section and join once at the end to avoid quadratic string concatenation.
+        section_lines = [(root, [])]
 
         for line in lines:
             if line.startswith("#"):
                 level = line.count("#")
                 title = line.strip("# ").strip()
                 new_section = {"content": "", "subsections": {}}
+                section_lines.append((new_section, []))
 
                 # Pop from stack until find the parent level
                 while current_path and current_path[-1][1] >= level:
@@ -581,7 +602,10 @@ class ArticleTextProcessing:
                 current_path[-1][0]["subsections"][title] = new_section
                 current_path.append((new_section, level))
             else:
-                current_path[-1][0]["content"] += line + "\n"
+                section_lines[-1][1].append(line)
+
+        for section, content_lines in section_lines:
+            section["content"] = "".join(f"{line}\n" for line in content_lines)
 
         return root["subsections"]
 